@@ -13,95 +13,82 @@ Created on Wed Jan  8 02:52:42 2025
 import os
 import pandas as pd
 import numpy as np
-from random import shuffle
-from file_extension_tester import listDirFiles
+from file_extension_tester import splitFileExtension, sniffFiles
 
-def CollectingData(directory, *, view=False, Shuffle=True):
-    """ Collects data and stores it into an array """
-    doc_ext = ['.djvu','.doc','.docx','.epub','.gcw','.htm','.html','.ods','.odt',
-     '.pdf','.ppt','.pptx','.txt','.xls','.xlsx']
-    img_ext = ['.bmp', '.cr2','.eps','.gif','.heif','.jpeg', '.jpg',
-               '.nef','.orf','.png','.raw','.sr2','.tif','.tiff','.webp']
-    music_ext = ['.aac', '.flac', '.m4a', '.mp3', '.ogg', '.wav', '.wma']
-    videos_ext = ['.avchd','.avi','.f4v','.flv','.html5','.m4v','.mkv','.mov','.mp4','.mpg2','.opus','.ogv','.swf','.webm','.wmv']
-    prog_ext = ['.action','.c','.cgi','.cs','.data','.dll','.do','.fcgi','.htm','.html','.ipynb', '.java',
-                '.jhtml','.jsp','.jspx','.pdsprj','.php','.php3','.php4','.phtml','.py','.qrc',
-                '.rb','.rhtml','.rss','.shtml','.swift','.vb','.workspace','.wss','.xhtml',
-                '.xml','.yaws']
-    exec_ext = ['.apk','.bat','.bin','.cmd','.com','.command','.deb',
-                '.exe','.osx','.pif','.run','.sh','.vbs','.wsh']
-    
-    documents, images, music, videos, programming, executable = listDirFiles(directory, size=False)
-    
-    # shuffle everything
-    if shuffle:
-        shuffle(documents)
-        shuffle(images)
-        shuffle(music)
-        shuffle(videos)
-        shuffle(programming)
-        shuffle(executable)
+# the file type names written to the statistics file, in the order of the categories
+FILE_TYPES = ['document', 'image', 'music', 'video', 'programming', 'executable program']
+
+def CollectingData(directory, *, view=False, Shuffle=True, index=None, seed=42,
+                   stats_file='previous_statistics.txt'):
+    """ Collects data and stores it into typed columns
+
+        every file is stat()-ed once, the columns are the file names (object),
+        the file type (categorical) and the size in bytes (int64)
+        index: optional directory_index.DirectoryIndex to read the folder from
+    """
+    names, codes, sizes = [], [], []
+    if index is not None:
+        for name, category, size in index.fileStats(directory):
+            names.append(name)
+            codes.append(category)
+            sizes.append(size)
     else:
-        pass
-    # then join the shuffled data
-    data = documents + images + music + videos + programming + executable
-    
-    #bytes_to_mbits = 1024 * 1024
-    Data = []
-    for file in data:
-        full_path = directory + '/' + file
-        
-        # saving to an external text-file for checking the statistics of the previously run processes
-        with open('previous_statistics.txt', 'a+') as File:
-            if '.' + file.split('.')[-1] in doc_ext:
-                Data.append([file, 'document', 
-                              os.path.getsize(full_path)])
-                File.write('{}, {}, {}\n'.format(file, 'document', 
-                                  str(os.path.getsize(full_path))))
-            elif '.' + file.split('.')[-1] in img_ext:
-                Data.append([file, 'image', 
-                              os.path.getsize(full_path)])
-                File.write('{}, {}, {}\n'.format(file, 'image', 
-                                  str(os.path.getsize(full_path))))
-            elif '.' + file.split('.')[-1] in music_ext:
-                Data.append([file, 'music', 
-                              os.path.getsize(full_path)])
-                File.write('{}, {}, {}\n'.format(file, 'music', 
-                                  str(os.path.getsize(full_path))))
-            elif '.' + file.split('.')[-1] in videos_ext:
-                Data.append([file, 'video', 
-                              os.path.getsize(full_path)])
-                File.write('{}, {}, {}\n'.format(file, 'video', 
-                                  str(os.path.getsize(full_path))))
-            elif '.' + file.split('.')[-1] in prog_ext:
-                Data.append([file, 'programming', 
-                              os.path.getsize(full_path)])
-                File.write('{}, {}, {}\n'.format(file, 'programming', 
-                                  str(os.path.getsize(full_path))))
-            elif '.' + file.split('.')[-1] in exec_ext:
-                Data.append([file, 'executable program', 
-                              os.path.getsize(full_path)])
-                File.write('{}, {}, {}\n'.format(file, 'executable program', 
-                                  str(os.path.getsize(full_path))))
-    # shuffle the data so that it doesn't appear biased since I joined the lists
-    # that were already in an orderly manner by their type
+        # the same rule as the index, the extension first and the contents of the rest
+        unknown = []
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                try:
+                    if not entry.is_file():
+                        continue
+                    size = entry.stat().st_size
+                except OSError:
+                    # removed whilst scanning
+                    continue
+                category = splitFileExtension(entry.name)[1]
+                if category is None:
+                    unknown.append((entry, size))
+                    continue
+                names.append(entry.name)
+                codes.append(category)
+                sizes.append(size)
+        for (entry, size), category in zip(unknown, sniffFiles([entry.path for entry, _ in unknown])):
+            if category is not None:
+                names.append(entry.name)
+                codes.append(category)
+                sizes.append(size)
+
+    names = np.array(names, dtype=object)
+    codes = np.array(codes, dtype=np.int8)
+    sizes = np.array(sizes, dtype=np.int64)
+
+    # the files are grouped by type (documents first, then images, etc.)
+    # and a single seeded permutation shuffles them so the data isn't biased
+    # by that order, the same seed gives the same order every run
     if Shuffle:
-        i = 0
-        while True:
-            shuffle(Data)
-            i += 1
-            if i == 42:
-                break
+        order = np.random.default_rng(seed).permutation(len(names))
     else:
-        pass
-    df = pd.DataFrame(np.array(Data), columns=['filename', 'file type', 'size (bytes)'])
+        order = np.argsort(codes, kind='stable')
+    names, codes, sizes = names[order], codes[order], sizes[order]
+
+    # saving to an external text-file for checking the statistics of the previously run processes
+    # one buffered write for the whole run
+    with open(stats_file, 'a') as File:
+        File.write(''.join('{}, {}, {}\n'.format(name, FILE_TYPES[code], size)
+                           for name, code, size in zip(names, codes, sizes)))
+
+    df = pd.DataFrame({'filename': names,
+                       'file type': pd.Categorical.from_codes(codes, categories=FILE_TYPES),
+                       'size (bytes)': sizes})
 
     if view == True:
         print(df)
     else:
         pass
     columns=['filename', 'type', 'size (bytes)']
-    return {'data':np.array(Data), 'features_names':columns}
+    # the rows as an array of strings, as before
+    data = np.array([[name, FILE_TYPES[code], str(size)]
+                     for name, code, size in zip(names, codes, sizes)])
+    return {'data':data, 'features_names':columns}
 
 #os.path.getsize(path)
 def getSize(filename):
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 17:22:08 2026
+
+@author: ngoni97
+"""
+# どうもありがとうございます == Dōmo arigatōgozaimasu
+
+# the statistics shown by the main window and the stats popup window, computed once
+# per folder in a single pass and cached until the folder's mtime changes
+
+import os
+from bisect import bisect_right
+from collections import OrderedDict, namedtuple
+
+import pandas as pd
+
+from file_extension_tester import CATEGORIES, splitFileExtension, sniffFiles
+
+ROW_LABELS = ['Documents', 'Images', 'Music', 'Videos', 'Programming', 'Executable']
+
+# upper bounds of the size histogram bins, the last bin takes everything above 1 GB
+SIZE_BINS = (10 * 1024, 100 * 1024, 1024 ** 2, 10 * 1024 ** 2, 100 * 1024 ** 2, 1024 ** 3)
+SIZE_LABELS = ['< 10 KB', '< 100 KB', '< 1 MB', '< 10 MB', '< 100 MB', '< 1 GB', '>= 1 GB']
+
+# counts and sizes are lists in the order of CATEGORIES,
+# histogram is one list of len(SIZE_LABELS) bin counts per category
+FolderStats = namedtuple('FolderStats', 'path mtime_ns counts sizes histogram')
+
+def formatSize(size):
+    """ 1536 -> '1.5 KB' """
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if size < 1024:
+            return '{:.0f} {}'.format(size, unit) if unit == 'B' else '{:.1f} {}'.format(size, unit)
+        size /= 1024
+    return '{:.1f} TB'.format(size)
+
+def statsFrame(stats, *, histogram=False):
+    """ DataFrame for a TableModel: Total and Size per category, optionally the size bins """
+    data = pd.DataFrame({'Total': stats.counts,
+                         'Size': [formatSize(size) for size in stats.sizes]},
+                        index=ROW_LABELS)
+    if histogram:
+        bins = pd.DataFrame(stats.histogram, columns=SIZE_LABELS, index=ROW_LABELS)
+        data = pd.concat([data, bins], axis=1)
+    return data
+
+def scanFiles(path):
+    """ Returns [(name, category, size)] of the listed files inside a folder,
+        unknown extensions are sniffed by their contents
+    """
+    rows = []
+    unknown = []
+    with os.scandir(path) as entries:
+        for entry in entries:
+            try:
+                if not entry.is_file():
+                    continue
+                size = entry.stat().st_size
+            except OSError:
+                continue
+            category = splitFileExtension(entry.name)[1]
+            if category is None:
+                unknown.append((entry.name, size))
+            else:
+                rows.append((entry.name, category, size))
+    if unknown:
+        categories = sniffFiles([os.path.join(path, name) for name, _ in unknown])
+        for (name, size), category in zip(unknown, categories):
+            if category is not None:
+                rows.append((name, category, size))
+    return rows
+
+
+class DirectoryStats():
+    """
+    Per-folder counts, total bytes and size histogram for every category
+
+    results are cached per (path, folder mtime), asking for the same folder again
+    costs one stat() until a file is added, removed or renamed inside it,
+    apply() updates the cached stats of a folder from the changes of the watcher
+    """
+    def __init__(self, index=None, *, max_entries=256):
+        # optional directory_index.DirectoryIndex to read the files from
+        self.index = index
+        self.max_entries = max_entries
+        self._cache = OrderedDict()
+
+    def get(self, path, *, refresh=False):
+        """ Returns the FolderStats of a folder
+
+            refresh=True lists the folder again even if its mtime hasn't changed
+        """
+        path = os.path.abspath(path)
+        mtime_ns = os.stat(path).st_mtime_ns
+        stats = self._cache.get(path)
+        if not refresh and stats is not None and stats.mtime_ns == mtime_ns:
+            self._cache.move_to_end(path)
+            return stats
+        return self._store(self._compute(path, mtime_ns, full=refresh))
+
+    def apply(self, path, counts, changes):
+        """ Updates the cached stats of a folder with the counts and changes reported by
+            directory_watcher.DirectoryWatcher, changes is [(category, old size, new size)]
+
+            returns the new FolderStats, or None if the folder isn't cached
+            (or the changes are unknown) and has to be listed again with get()
+        """
+        path = os.path.abspath(path)
+        stats = self._cache.get(path)
+        if stats is None or changes is None:
+            return None
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+        sizes = list(stats.sizes)
+        histogram = [list(bins) for bins in stats.histogram]
+        for category, old_size, new_size in changes:
+            if old_size is not None:
+                sizes[category] -= old_size
+                histogram[category][bisect_right(SIZE_BINS, old_size)] -= 1
+            if new_size is not None:
+                sizes[category] += new_size
+                histogram[category][bisect_right(SIZE_BINS, new_size)] += 1
+        return self._store(FolderStats(path, mtime_ns, list(counts), sizes, histogram))
+
+    def _store(self, stats):
+        """ Caches the stats of a folder, the least recently used are dropped """
+        self._cache[stats.path] = stats
+        self._cache.move_to_end(stats.path)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+        return stats
+
+    def _compute(self, path, mtime_ns, full=False):
+        """ Single pass over the folder's files """
+        if self.index is not None:
+            rows = self.index.fileStats(path, full=full)
+        else:
+            rows = scanFiles(path)
+
+        counts = [0] * len(CATEGORIES)
+        sizes = [0] * len(CATEGORIES)
+        histogram = [[0] * len(SIZE_LABELS) for _ in CATEGORIES]
+        for _, category, size in rows:
+            size = size or 0
+            counts[category] += 1
+            sizes[category] += size
+            histogram[category][bisect_right(SIZE_BINS, size)] += 1
+        return FolderStats(path, mtime_ns, counts, sizes, histogram)
+
+
+if __name__ == "__main__":
+    import time
+
+    test_path = os.path.expanduser('~/Downloads')
+    stats = DirectoryStats()
+
+    start = time.perf_counter()
+    print(statsFrame(stats.get(test_path), histogram=True))
+    print('first call: {:.2f} ms'.format((time.perf_counter() - start) * 1000))
+
+    start = time.perf_counter()
+    stats.get(test_path)
+    print('cached call: {:.3f} ms'.format((time.perf_counter() - start) * 1000))
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 14:05:27 2026
+
+@author: ngoni97
+"""
+# どうもありがとうございます == Dōmo arigatōgozaimasu
+
+# keeps the per-category file counts and sizes of the opened folders up to date using linux inotify
+# instead of listing and classifying the folder again every time it is displayed
+
+import os
+import sys
+import select
+import struct
+import ctypes
+import ctypes.util
+from threading import Thread, Lock
+from collections import OrderedDict
+
+from file_extension_tester import CATEGORIES, splitFileExtension, sniffFile
+from directory_stats import scanFiles
+
+# <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = getattr(os, 'O_CLOEXEC', 0o2000000)
+
+# IN_CLOSE_WRITE for the sizes of files written after they were created
+_WATCH_MASK = (IN_CREATE | IN_CLOSE_WRITE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO
+               | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR)
+# struct inotify_event { int wd; uint32_t mask; uint32_t cookie; uint32_t len; char name[]; }
+_EVENT = struct.Struct('iIII')
+
+def _loadInotify():
+    """ Returns the libc inotify functions or None when they aren't available (not linux) """
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        functions = libc.inotify_init1, libc.inotify_add_watch, libc.inotify_rm_watch
+    except (OSError, AttributeError):
+        return None
+    init1, add_watch, rm_watch = functions
+    init1.argtypes = [ctypes.c_int]
+    add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+    return functions
+
+_INOTIFY = _loadInotify()
+
+def isAvailable():
+    """ True if inotify can be used on this system """
+    return _INOTIFY is not None
+
+def _check(result):
+    """ Raises an OSError from errno if a libc call failed """
+    if result < 0:
+        errno = ctypes.get_errno()
+        raise OSError(errno, os.strerror(errno))
+    return result
+
+def listFiles(path):
+    """ Lists a folder once, returns its counts per category and {name: (category, size)} """
+    files = {name: (category, size) for name, category, size in scanFiles(path)}
+    counts = [0] * len(CATEGORIES)
+    for category, _ in files.values():
+        counts[category] += 1
+    return counts, files
+
+def _fileSize(path):
+    """ The size of a file, None if it has already gone again """
+    try:
+        return os.stat(path).st_size
+    except OSError:
+        return None
+
+
+class DirectoryWatcher(Thread):
+    """
+    A background thread that watches folders with inotify and applies the
+    create, write, delete and move events to each folder's category counts
+
+    callback(path, counts, changes) is called from the watcher thread whenever a
+    watched folder changes, counts is a list in the order of CATEGORIES and changes
+    a list of (category, old size, new size) of the files that changed, the old size
+    is None for a new file and the new size None for a removed one, changes is None
+    when the events were lost and the folder was listed again
+    """
+    def __init__(self, callback=None, *, max_watches=64):
+        super().__init__(name='DirectoryWatcher', daemon=True)
+        if _INOTIFY is None:
+            raise OSError('inotify is not available on this system')
+        self._init1, self._add_watch, self._rm_watch = _INOTIFY
+        self.callback = callback
+        self.max_watches = max_watches
+
+        self._fd = _check(self._init1(IN_NONBLOCK | IN_CLOEXEC))
+        # writing to the pipe wakes the thread up to stop it
+        self._stop_read, self._stop_write = os.pipe()
+        self.lock = Lock()
+        # watch descriptor -> path, and path -> [watch descriptor, counts, {name: (category, size)}]
+        # in LRU order
+        self._paths = {}
+        self._watches = OrderedDict()
+
+    def watch(self, path):
+        """ Starts watching a folder and returns its counts
+
+            for a folder that is already watched this is a dictionary lookup,
+            the least recently used folder is dropped after max_watches folders
+        """
+        path = os.path.abspath(path)
+        with self.lock:
+            if path in self._watches:
+                self._watches.move_to_end(path)
+                return list(self._watches[path][1])
+
+            # watch first, then list, so no file can slip in between the two
+            wd = _check(self._add_watch(self._fd, os.fsencode(path), _WATCH_MASK))
+            counts, files = listFiles(path)
+            self._paths[wd] = path
+            self._watches[path] = [wd, counts, files]
+
+            while len(self._watches) > self.max_watches:
+                old_path, (old_wd, _, _) = self._watches.popitem(last=False)
+                self._paths.pop(old_wd, None)
+                self._rm_watch(self._fd, old_wd)
+            return list(counts)
+
+    def counts(self, path):
+        """ Returns the counts of a watched folder or None if it isn't watched """
+        with self.lock:
+            watch = self._watches.get(os.path.abspath(path))
+            return list(watch[1]) if watch else None
+
+    def unwatch(self, path):
+        """ Stops watching a folder """
+        with self.lock:
+            watch = self._watches.pop(os.path.abspath(path), None)
+            if watch:
+                self._paths.pop(watch[0], None)
+                self._rm_watch(self._fd, watch[0])
+
+    def stop(self):
+        """ Stops the thread and closes the inotify descriptor """
+        os.write(self._stop_write, b'x')
+        if self.is_alive():
+            self.join()
+        for fd in (self._fd, self._stop_read, self._stop_write):
+            os.close(fd)
+
+    def _dropWatch(self, wd):
+        """ The folder was deleted or moved away, inotify has removed the watch """
+        path = self._paths.pop(wd, None)
+        if path is not None:
+            self._watches.pop(path, None)
+
+    def _applyEvent(self, path, name, mask):
+        """ Applies one event on a file, returns (category, old size, new size) or None """
+        counts, files = self._watches[path][1:]
+        if mask & (IN_DELETE | IN_MOVED_FROM):
+            old = files.pop(name, None)
+            if old is None:
+                return None
+            counts[old[0]] = max(counts[old[0]] - 1, 0)
+            return old[0], old[1], None
+
+        # created, moved in or written, only the named file is stat()-ed
+        file_path = os.path.join(path, name)
+        size = _fileSize(file_path)
+        if size is None:
+            return None
+        old = files.get(name)
+        if old is not None:
+            if old[1] == size:
+                return None
+            files[name] = (old[0], size)
+            return old[0], old[1], size
+        category = splitFileExtension(name)[1]
+        if category is None:
+            # unknown extensions are sniffed like the folder listing does, a new file
+            # is usually still empty so it's sniffed again when it has been written
+            category = sniffFile(file_path)
+            if category is None:
+                return None
+        files[name] = (category, size)
+        counts[category] += 1
+        return category, None, size
+
+    def _applyEvents(self, buffer):
+        """ Applies a buffer of events, returns {path: (counts, changes)} of the folders that changed """
+        changed = {}
+        offset = 0
+        with self.lock:
+            while offset < len(buffer):
+                wd, mask, _, length = _EVENT.unpack_from(buffer, offset)
+                name = buffer[offset + _EVENT.size:offset + _EVENT.size + length].rstrip(b'\0')
+                offset += _EVENT.size + length
+
+                if mask & IN_Q_OVERFLOW:
+                    # events were lost, list every watched folder again
+                    for path, watch in self._watches.items():
+                        try:
+                            watch[1:] = listFiles(path)
+                        except OSError:
+                            continue
+                        changed[path] = None
+                    continue
+                if mask & (IN_IGNORED | IN_DELETE_SELF | IN_MOVE_SELF):
+                    self._dropWatch(wd)
+                    continue
+                if mask & IN_ISDIR or wd not in self._paths:
+                    continue
+
+                path = self._paths[wd]
+                change = self._applyEvent(path, os.fsdecode(name), mask)
+                if change is None:
+                    continue
+                if path not in changed:
+                    changed[path] = []
+                if changed[path] is not None:
+                    changed[path].append(change)
+            return {path: (list(self._watches[path][1]), changes) for path, changes in changed.items()
+                    if path in self._watches}
+
+    def run(self):
+        while True:
+            readable, _, _ = select.select([self._fd, self._stop_read], [], [])
+            if self._stop_read in readable:
+                return
+            try:
+                buffer = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                continue
+            changed = self._applyEvents(buffer)
+            if self.callback is not None:
+                for path, (counts, changes) in changed.items():
+                    self.callback(path, counts, changes)
+
+
+if __name__ == "__main__":
+    import time
+
+    def report(path, counts, changes):
+        print(path, dict(zip(CATEGORIES, counts)), changes)
+
+    test_path = os.path.expanduser('~/Downloads')
+    watcher = DirectoryWatcher(report)
+    watcher.start()
+    print(test_path, dict(zip(CATEGORIES, watcher.watch(test_path))))
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        watcher.stop()
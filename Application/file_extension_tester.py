@@ -11,7 +11,14 @@ Created on Wed Nov 27 13:23:20 2024
 # to help with the choice of the algorithm whether it be automatic or intentionally
 
 import os 
+import re
+import mmap
+import stat
 import timeit
+from types import MappingProxyType
+
+# category names, in the same order as the lists returned by fileExtensions()
+CATEGORIES = ('documents', 'images', 'music', 'videos', 'programming', 'executable')
 
 def fileExtensions():
     doc_ext = ['.djvu', '.doc', '.docx', '.epub', '.gcw', '.htm', '.html', 
@@ -30,66 +37,221 @@ def fileExtensions():
                 '.pif', '.run', '.sh', '.vbs', '.wsh']
     return doc_ext, img_ext, music_ext, videos_ext, prog_ext, exec_ext
 
-def listDirFiles(path, size=True, fullpath=False):
+def _buildExtensionTable():
+    """ Builds the frozen suffix -> category lookup table from fileExtensions()
+        an extension listed in more than one category (e.g. '.htm', '.html')
+        is kept in the first one so every file lands in a single bucket
+    """
+    table = {}
+    for category, extensions in enumerate(fileExtensions()):
+        for extension in extensions:
+            table.setdefault(extension.lower(), category)
+    return MappingProxyType(table)
+
+# built once at import: '.pdf' -> 0 (documents), '.jpg' -> 1 (images), etc.
+EXTENSION_TABLE = _buildExtensionTable()
+# number of dots in the longest listed suffix, 2 for a compound one like '.tar.gz'
+_SUFFIX_PARTS = max(extension.count('.') for extension in EXTENSION_TABLE)
+
+def splitFileExtension(file):
+    """ Splits a file name into (stem, category)
+
+        category is the index into CATEGORIES or None if the extension isn't listed,
+        the lookup is case-insensitive and compound suffixes are matched before
+        their last part, e.g. '.tar.gz' before '.gz'
+    """
+    # str.rfind rather than os.path.splitext, this runs once per file
+    # a leading dot is a hidden file ('.bashrc'), not an extension
+    dot = file.rfind('.')
+    if dot <= 0:
+        return file, None
+    match = (file[:dot], EXTENSION_TABLE.get(file[dot:].lower()))
+    # compound suffixes, only searched when the table has any
+    for _ in range(_SUFFIX_PARTS - 1):
+        dot = file.rfind('.', 0, dot)
+        if dot <= 0:
+            break
+        category = EXTENSION_TABLE.get(file[dot:].lower())
+        if category is not None:
+            match = (file[:dot], category)
+    return match
+
+def classifyFiles(files, unknown=None):
+    """ Sorts file names into one list per category (in the order of CATEGORIES)
+        with a single table lookup per file, unlisted files are left out
+        or appended to the unknown list if one is given
+    """
+    buckets = ([], [], [], [], [], [])
+    if _SUFFIX_PARTS > 1 or unknown is not None:
+        for file in files:
+            category = splitFileExtension(file)[1]
+            if category is not None:
+                buckets[category].append(file)
+            elif unknown is not None:
+                unknown.append(file)
+        return buckets
+
+    # the common case inlined: one rfind and one dict lookup per file
+    lookup = EXTENSION_TABLE.get
+    for file in files:
+        dot = file.rfind('.')
+        if dot > 0:
+            category = lookup(file[dot:].lower())
+            if category is not None:
+                buckets[category].append(file)
+    return buckets
+
+# content sniffing for the files the extension table can't place
+# (misnamed files, downloads without an extension), at most SNIFF_BYTES are read
+SNIFF_BYTES = 4096
+
+# (category, signature) matched at the start of the file, the first match wins
+# so the specific zip/riff/ftyp containers come before anything more generic
+_MAGIC_SIGNATURES = [
+    # documents
+    (0, rb'%PDF-'),
+    (0, rb'AT&TFORM.{4}DJV[UMI]'),
+    (0, rb'PK\x03\x04.{26}mimetypeapplication/epub\+zip'),
+    (0, rb'PK\x03\x04.{26}mimetypeapplication/vnd\.oasis\.opendocument'),
+    (0, rb'PK\x03\x04.{26}(?:\[Content_Types\]\.xml|_rels/\.rels|word/|xl/|ppt/)'),
+    (0, rb'\xD0\xCF\x11\xE0\xA1\xB1\x1A\xE1'),
+    (0, rb'\{\\rtf'),
+    (0, rb'(?:\xEF\xBB\xBF)?\s*(?i:<!DOCTYPE html|<html)'),
+    # executable, the android packages before the zip based programming files
+    (5, rb'PK\x03\x04.{26}(?:AndroidManifest\.xml|classes\.dex|META-INF/)'),
+    # images
+    (1, rb'\xFF\xD8\xFF'),
+    (1, rb'\x89PNG\r\n\x1A\n'),
+    (1, rb'GIF8[79]a'),
+    (1, rb'BM.{12}[\x0C\x28\x38\x40\x6C\x7C]\x00\x00\x00'),
+    (1, rb'II\*\x00|MM\x00\*'),
+    (1, rb'RIFF.{4}WEBP'),
+    (1, rb'.{4}ftyp(?:heic|heix|hevc|mif1|msf1|avif)'),
+    (1, rb'%!PS-Adobe'),
+    # music
+    (2, rb'ID3'),
+    (2, rb'fLaC'),
+    (2, rb'RIFF.{4}WAVE'),
+    (2, rb'.{4}ftypM4A '),
+    (2, rb'OggS.{24}(?:\x01vorbis|OpusHead)'),
+    (2, rb'\xFF[\xE2\xE3\xF2\xF3\xFA\xFB]'),
+    # videos
+    (3, rb'.{4}ftyp(?:isom|iso2|mp41|mp42|avc1|M4V |qt  |3gp)'),
+    (3, rb'\x1A\x45\xDF\xA3'),
+    (3, rb'RIFF.{4}AVI '),
+    (3, rb'FLV\x01'),
+    (3, rb'[FCZ]WS'),
+    (3, rb'\x00\x00\x01[\xBA\xB3]'),
+    (3, rb'OggS'),
+    (3, rb'\x30\x26\xB2\x75\x8E\x66\xCF\x11'),
+    # programming
+    (4, rb'(?:\xEF\xBB\xBF)?<\?xml'),
+    (4, rb'<\?php'),
+    # executable
+    (5, rb'MZ'),
+    (5, rb'\x7FELF'),
+    (5, rb'#!'),
+    (5, rb'\xCA\xFE\xBA\xBE|\xCF\xFA\xED\xFE|\xCE\xFA\xED\xFE|\xFE\xED\xFA[\xCE\xCF]'),
+    (5, rb'!<arch>\ndebian'),
+]
+# one compiled pattern, each signature in its own group so match.lastindex gives the signature
+_MAGIC_PATTERN = re.compile(b'|'.join(b'(' + signature + b')' for _, signature in _MAGIC_SIGNATURES),
+                            re.DOTALL)
+_MAGIC_CATEGORIES = (None,) + tuple(category for category, _ in _MAGIC_SIGNATURES)
+
+# O_NONBLOCK so that opening a fifo doesn't wait for a writer
+_SNIFF_FLAGS = os.O_RDONLY | getattr(os, 'O_NONBLOCK', 0) | getattr(os, 'O_BINARY', 0)
+
+def _openRegularFile(path):
+    """ os.open of path if it's a regular file, None for folders, fifos, sockets and devices """
+    fd = os.open(path, _SNIFF_FLAGS)
+    if not stat.S_ISREG(os.fstat(fd).st_mode):
+        os.close(fd)
+        return None
+    return fd
+
+def sniffFile(path):
+    """ Returns the category of a file from its first bytes, or None if it isn't recognised """
+    try:
+        fd = _openRegularFile(path)
+        if fd is None:
+            return None
+        try:
+            if hasattr(os, 'pread'):
+                head = os.pread(fd, SNIFF_BYTES, 0)
+            else:
+                # windows has no pread
+                head = os.read(fd, SNIFF_BYTES)
+        finally:
+            os.close(fd)
+    except OSError:
+        # removed or unreadable files
+        return None
+    match = _MAGIC_PATTERN.match(head)
+    return _MAGIC_CATEGORIES[match.lastindex] if match else None
+
+def sniffFiles(paths):
+    """ sniffFile for a batch of paths, returns a list of categories (None if not recognised)
+
+        every file is read into the same anonymous mmap buffer with os.preadv
+        and matched in place, so the batch doesn't allocate a new buffer per file
+    """
+    if not hasattr(os, 'preadv'):
+        return [sniffFile(path) for path in paths]
+
+    categories = []
+    with mmap.mmap(-1, SNIFF_BYTES) as buffer:
+        for path in paths:
+            category = None
+            length = 0
+            try:
+                fd = _openRegularFile(path)
+                if fd is not None:
+                    try:
+                        length = os.preadv(fd, [buffer], 0)
+                    finally:
+                        os.close(fd)
+            except OSError:
+                length = 0
+            if length:
+                match = _MAGIC_PATTERN.match(buffer, 0, length)
+                if match:
+                    category = _MAGIC_CATEGORIES[match.lastindex]
+            categories.append(category)
+    return categories
+
+def _isFile(entry):
+    """ entry.is_file() of a scandir entry, False if it has gone """
+    try:
+        return entry.is_file()
+    except OSError:
+        return False
+
+def listDirFiles(path, size=True, fullpath=False, sniff=True, verbose=False):
     # if size==False, then return the data as a list
-    files = [file for file in os.listdir(path)]
-    # loading file extensions
-    doc_ext, img_ext, music_ext, videos_ext, prog_ext, exec_ext = fileExtensions()
-    # creating lists to append respective files
-    documents = []
-    images = []
-    music = []
-    videos = []
-    programming = []
-    executable = []
+    # verbose=True prints the file names of every category along with the counts
+    # files the extension table can't place are sniffed by their contents (sniff=True)
+    # only regular files are sniffed, never folders, fifos or sockets
+    unknown = [] if sniff else None
+    with os.scandir(path) as it:
+        entries = {entry.name: entry for entry in it}
+    documents, images, music, videos, programming, executable = buckets = classifyFiles(entries, unknown)
+    if unknown:
+        unknown = [file for file in unknown if _isFile(entries[file])]
+        for file, category in zip(unknown, sniffFiles([os.path.join(path, file) for file in unknown])):
+            if category is not None:
+                buckets[category].append(file)
     
     # if fullpath is True
-    if fullpath == False:
-        # appending respective files
-        for file in files:
-            for item in doc_ext:
-                if file.endswith(item):
-                    documents.append(file)
-            for item in img_ext:
-                if file.endswith(item):
-                    images.append(file)
-            for item in music_ext:
-                if file.endswith(item):
-                    music.append(file)
-            for item in videos_ext:
-                if file.endswith(item):
-                    videos.append(file)
-            for item in prog_ext:
-                if file.endswith(item):
-                    programming.append(file)
-            for item in exec_ext:
-                if file.endswith(item):
-                    executable.append(file)
-    else:
-        # appending respective files
-        for file in files:
-            for item in doc_ext:
-                if file.endswith(item):
-                    documents.append(os.path.join(path,file))
-            for item in img_ext:
-                if file.endswith(item):
-                    images.append(os.path.join(path,file))
-            for item in music_ext:
-                if file.endswith(item):
-                    music.append(os.path.join(path,file))
-            for item in videos_ext:
-                if file.endswith(item):
-                    videos.append(os.path.join(path,file))
-            for item in prog_ext:
-                if file.endswith(item):
-                    programming.append(os.path.join(path,file))
-            for item in exec_ext:
-                if file.endswith(item):
-                    executable.append(os.path.join(path,file))
+    if fullpath == True:
+        documents, images, music, videos, programming, executable = [
+            [os.path.join(path, file) for file in bucket]
+            for bucket in (documents, images, music, videos, programming, executable)]
                 
     if size == True:
-        print('documents',documents, '\n\nimages', images, '\n\nmusic',
-              music, '\n\nvideos', videos, '\n\nprogramming', programming, '\n\nexecutable', executable)
+        if verbose:
+            print('documents',documents, '\n\nimages', images, '\n\nmusic',
+                  music, '\n\nvideos', videos, '\n\nprogramming', programming, '\n\nexecutable', executable)
         return len(documents), len(images), len(music), len(videos), len(programming), len(executable)
     elif size == False:
         return [documents, images, music, videos, programming, executable]
@@ -115,6 +277,4 @@ if __name__ == "__main__":
     time_it()
  
 # windows os
-#path = "C:/Users/Admin/Downloads/Other Stuff"
-
-""" later on add the feature of reporting other files not listed in the main lists """
\ No newline at end of file
+#path = "C:/Users/Admin/Downloads/Other Stuff"
\ No newline at end of file
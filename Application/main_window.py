@@ -3,10 +3,9 @@
 
 import sys
 import os
-import pandas as pd
 from PyQt5 import uic
 from PyQt5.QtGui import QKeyEvent
-from PyQt5.QtCore import QModelIndex, Qt, QDir, QAbstractTableModel
+from PyQt5.QtCore import QModelIndex, Qt, QDir, QAbstractTableModel, QObject, pyqtSignal
 from PyQt5.QtWidgets import (
     QApplication,
     QTreeView, 
@@ -21,7 +20,9 @@ from PyQt5.QtWidgets import (
 
 from main_MainWindow import PopUpMainWindow
 from linked_directories_class import LinkedDirectory
-from file_extension_tester import listDirFiles
+from directory_index import DirectoryIndex
+from directory_stats import DirectoryStats, statsFrame
+from directory_watcher import DirectoryWatcher, isAvailable
 from stats_pop_up_window import StatsPopupWindow
 from move_files_module import Move, _Move, __Move
 from collecting_data import CollectingData
@@ -51,6 +52,12 @@ class TableModel(QAbstractTableModel):
                 return str(self._data.index[section])   
 
 
+class WatcherBridge(QObject):
+    """ Carries the folder changes from the watcher thread to the GUI thread """
+    # path, counts, changes (a list, or None when the folder has to be listed again)
+    countsChanged = pyqtSignal(str, list, object)
+
+
 class MainWindow(QMainWindow):
     def __init__(self, dir_path, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -70,15 +77,26 @@ class MainWindow(QMainWindow):
         uic.loadUi('MainWindow.ui', self)
 
         self.popUp = PopUpMainWindow() # description pop-up window reference
+        # on-disk index of the scanned folders, unchanged folders aren't listed again
+        self.index = DirectoryIndex()
+        # counts, sizes and size histogram per folder, cached until the folder changes
+        self.stats = DirectoryStats(self.index)
+        # live updates: the watcher thread reports changes in the opened folders
+        # and the signal makes sure the views are only touched from the GUI thread
+        self._shown_dir = None
+        self.watcher = None
+        if isAvailable():
+            self._watcherBridge = WatcherBridge()
+            self._watcherBridge.countsChanged.connect(self._folder_changed)
+            self.watcher = DirectoryWatcher(self._watcherBridge.countsChanged.emit)
+            self.watcher.start()
         self.directory = LinkedDirectory() # linked directories class reference
 
         self.ListView()
         self.ListView2(self.dir_path)
         
         # the initial state of the stats pop up window
-        documents, images, music, videos, programming, executable = listDirFiles(self.dir_path)
-        # .filePath converts a QModelIndex to directory path as str
-        Data = [documents, images, music, videos, programming, executable]
+        Data = self._folder_stats(self.dir_path)
         self.statsPopup = StatsPopupWindow(Data, self.dir_path) # statistics popup window reference
         
         # File/Folder 
@@ -175,6 +193,50 @@ class MainWindow(QMainWindow):
         print('new path = ', path)
         pass
     
+    def _folder_path(self, directory):
+        """ Converts a QModelIndex to a directory path, a str is returned as it is """
+        if not isinstance(directory, str):
+            # .filePath converts a QModelIndex to directory path as str
+            directory = self.model.filePath(directory)
+        # the same form as the paths reported by the watcher
+        return os.path.abspath(directory)
+
+    def _folder_stats(self, directory):
+        """ Returns the directory_stats.FolderStats of a folder (str or QModelIndex)
+
+            computed once per folder and cached until the folder changes,
+            the folder is also watched from then on for live updates
+        """
+        path = self._folder_path(directory)
+        if self.watcher is not None:
+            try:
+                self.watcher.watch(path)
+            except OSError:
+                # e.g. the inotify watch limit has been reached
+                pass
+        return self.stats.get(path)
+
+    def _folder_changed(self, path, counts, changes):
+        """ Slot for the watcher: files were added, removed or written in a watched folder """
+        # the watcher's counts and size changes are applied to the cached stats,
+        # the folder is only listed again if they aren't cached or events were lost
+        stats = self.stats.apply(path, counts, changes)
+        if stats is None and (changes is None or path == self._shown_dir):
+            stats = self.stats.get(path, refresh=True)
+        if path != self._shown_dir:
+            return
+        self._show_stats(stats)
+        self.statsPopup.updateData(stats, path)
+
+    def _show_stats(self, stats):
+        """ Display the stats in the tableView of the select folder tab """
+        self._Data = stats
+        
+        data = statsFrame(self._Data)
+        
+        self.Model = TableModel(data)
+        self.tableView.setModel(self.Model)
+
     def _stats_popup_window(self, directory=None,*, view=True): # public method
         """ Display the statistics of a given folder
 
@@ -182,24 +244,10 @@ class MainWindow(QMainWindow):
         """
         # if run from the original root directory New_dir before the update upon launching the app
         # or when you want to access the window from the menubar
-        if not isinstance(directory, str):
-            # if loading from the _change_dir or the updated path New_dir for the Statistics QAction
-            documents, images, music, videos, programming, executable = listDirFiles(self.model.filePath(directory))
-        else:
-            # if loading form the original root path 
-            documents, images, music, videos, programming, executable = listDirFiles(directory)
-        #documents, images, music, videos, programming, executable = listDirFiles(self.model.filePath(directory))
-        # .filePath converts a QModelIndex to directory path as str
-        Data = [documents, images, music, videos, programming, executable]
-        # updating the original data
-        # if directory is str then use it as it is
-        # else convert it from QModelIndex to str
-        if not isinstance(directory, str):
-            # if QModelIndex
-            self.statsPopup = StatsPopupWindow(Data, self.model.filePath(directory)) # statistics popup window reference update
-        else:
-            # if already str
-            self.statsPopup = StatsPopupWindow(Data, directory)
+        path = self._folder_path(directory)
+        Data = self._folder_stats(path)
+        # updating the original data, the window is reused rather than loaded again
+        self.statsPopup.updateData(Data, path)
         if view == True:
             self.statsPopup.show()
         else:
@@ -226,23 +274,9 @@ class MainWindow(QMainWindow):
 
     def _display_stats(self, directory):
         ''' Display data in the select folder tab '''
-        if not isinstance(directory, str):
-            # if loading from the _change_dir or the updated path New_dir for the Statistics QAction
-            documents, images, music, videos, programming, executable = listDirFiles(self.model.filePath(directory))
-        else:
-            # if loading form the original root path 
-            documents, images, music, videos, programming, executable = listDirFiles(directory)
-        #documents, images, music, videos, programming, executable = listDirFiles(self.model.filePath(directory))
-
-        # .filePath converts a QModelIndex to directory path as str
-        self._Data = [documents, images, music, videos, programming, executable]
-        
-        data = pd.DataFrame(self._Data,
-                            columns=['Total'],
-                            index=['Documents', 'Images', 'Music', 'Videos', 'Programming', 'Executable'])
-        
-        self.Model = TableModel(data)
-        self.tableView.setModel(self.Model)
+        # the watcher keeps this folder's stats current from now on
+        self._shown_dir = self._folder_path(directory)
+        self._show_stats(self._folder_stats(self._shown_dir))
     
     def _Change_dir(self, New_dir):
         """ changing directory of listView2 from selecting in the listView one """
@@ -251,7 +285,6 @@ class MainWindow(QMainWindow):
         print('testing newDirectory', New_dir)
         self.directory.addDir(New_dir)
         #print('new_dir as string', self.model.filePath(new_dir))
-        print(listDirFiles(self.model.filePath(New_dir)))
         # display stats popup window
         if self.ShowStatsPopUpWindow:
             # if checked then show
@@ -285,7 +318,6 @@ class MainWindow(QMainWindow):
         print('testing newDirectory', new_dir)
         self.directory.addDir(new_dir)
         #print('new_dir as string', self.model.filePath(new_dir))
-        print(listDirFiles(self.model.filePath(new_dir)))
         # display stats popup window
         if self.ShowStatsPopUpWindow:
             # if checked then show
@@ -409,6 +441,13 @@ class MainWindow(QMainWindow):
         # add the functionality of choosing the colour as per user preference in the settings
         #self.listView.setStyleSheet("alternate-background-color: white;background-color: green;")
 
+    def closeEvent(self, event):
+        """ Stop the folder watcher thread when the window is closed """
+        if self.watcher is not None:
+            self.watcher.stop()
+            self.watcher = None
+        super().closeEvent(event)
+
     def __Pop_up_Window(self, checked): # private method
         """ Private Method
             Launch the description window
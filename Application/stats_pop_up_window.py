@@ -12,6 +12,8 @@ from PyQt5.QtCore import QModelIndex, Qt, QDir, QAbstractTableModel
 from PyQt5.QtWidgets import QApplication, QMainWindow, QDialog
 import pandas as pd
 
+from directory_stats import statsFrame
+
 class TableModel(QAbstractTableModel):
     def __init__(self, data):
         super().__init__()
@@ -45,15 +47,20 @@ class StatsPopupWindow(QMainWindow, QDialog):
         # load the UI file
         uic.loadUi('statistics_popup_window.ui', self)
         
-        data = pd.DataFrame(self._Data,
-                            columns=['Total'],
-                            index=['Documents', 'Images', 'Music', 'Videos', 'Programming', 'Executable'])
+        self.updateData(self._Data, self._directory)
+
+        self.OkButton.clicked.connect(self.accept)
+        
+    def updateData(self, Data, directory_path=None):
+        """ Displays new stats (directory_stats.FolderStats) without loading the UI file again """
+        self._Data = Data
+        if directory_path is not None:
+            self._directory = directory_path
+        data = statsFrame(self._Data, histogram=True)
         
         self.model = TableModel(data)
         self.tableView.setModel(self.model)
         self.label.setText(self._directory)
-
-        self.OkButton.clicked.connect(self.accept)
         
     def keyPressEvent(self, event):
         '''if isinstance(event, QKeyEvent):
@@ -73,12 +80,12 @@ class StatsPopupWindow(QMainWindow, QDialog):
         self.close()
 
 if __name__ == "__main__":
-    from file_extension_tester import listDirFiles
+    from directory_stats import DirectoryStats
 
     App = QApplication(sys.argv)
-    documents, images, music, videos, programming, executable = listDirFiles("C:/Users/Admin/Downloads/Unsorted")
-    Data = [documents, images, music, videos, programming, executable]    
-    window = StatsPopupWindow(Data)
+    path = "C:/Users/Admin/Downloads/Unsorted"
+    Data = DirectoryStats().get(path)
+    window = StatsPopupWindow(Data, path)
     window.show()
     sys.exit(App.exec_())
 
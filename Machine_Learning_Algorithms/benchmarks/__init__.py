@@ -0,0 +1,9 @@
+# filesystem scan benchmarks
+# run with: python -m benchmarks --help (from Machine_Learning_Algorithms)
+import os
+import sys
+
+# the modules being timed import each other as siblings
+_MODULES = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _MODULES not in sys.path:
+    sys.path.insert(0, _MODULES)
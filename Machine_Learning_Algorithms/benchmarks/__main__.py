@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 19:58:26 2026
+
+@author: ngoni97
+"""
+# どうもありがとうございます == Dōmo arigatōgozaimasu
+
+# python -m benchmarks --output results.json
+# python -m benchmarks --scale 0.1 --compare results.json
+
+import os
+import sys
+import argparse
+
+# also runnable as python benchmarks/, outside of the package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic_trees import TREES
+from benchmarks.scan_benchmarks import runBenchmarks, compareResults
+
+parser = argparse.ArgumentParser(prog='benchmarks', description='times the filesystem scanners on synthetic trees')
+parser.add_argument('--trees', nargs='+', choices=list(TREES), default=list(TREES))
+parser.add_argument('--scale', type=float, default=1.0,
+                    help='multiplies the tree sizes, e.g. 0.1 for a quick run')
+parser.add_argument('--repeat', type=int, default=3)
+parser.add_argument('--workers', type=int, default=8)
+parser.add_argument('--seed', type=int, default=0)
+parser.add_argument('--output', help='json file to write the results to')
+parser.add_argument('--compare', help='json results of an earlier run to compare against')
+parser.add_argument('--keep', action='store_true', help="don't delete the generated trees")
+args = parser.parse_args()
+
+results = runBenchmarks(trees=args.trees, scale=args.scale, repeat=args.repeat, workers=args.workers,
+                        seed=args.seed, output=args.output, keep=args.keep)
+if args.compare:
+    compareResults(args.compare, results)
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Tue Oct 20 14:37:08 2026
+
+@author: ngoni97
+"""
+# どうもありがとうございます == Dōmo arigatōgozaimasu
+
+# reading whole textbooks against a token budget (PdfDataCollector(max_tokens=...)):
+# the extraction time per book and the accuracy of the classifier trained on the text
+# python -m benchmarks.budget_benchmarks (from Machine_Learning_Algorithms)
+
+import os
+import sys
+import json
+import time
+import shutil
+import tempfile
+
+import numpy as np
+import pymupdf
+
+from fixed_pdf_collector import PdfDataCollector
+
+COMMON = ('the of and to in is that for it as with be on this are by an which we from or at can where '
+          'given each when there these then have also such if one two three first second note example').split()
+
+CATEGORIES = {
+    'Mathematics': 'theorem lemma proof integral matrix vector eigenvalue polynomial derivative topology '
+                   'manifold group ring field prime sequence series convergence limit'.split(),
+    'Physics': 'energy momentum particle quantum field force mass velocity acceleration wave photon '
+               'electron thermodynamics entropy relativity gravity charge'.split(),
+    'Chemistry': 'molecule atom bond reaction acid base electron orbital compound solution catalyst '
+                 'equilibrium oxidation polymer isomer enthalpy'.split(),
+    'Biology': 'cell protein gene organism species evolution enzyme membrane tissue dna rna '
+               'metabolism population ecology receptor mitochondria'.split(),
+}
+
+# the budgets timed, None reads every page
+BUDGETS = (None, 5000, 2000, 500)
+
+def makeTextbook(path, words, rng, *, pages=60, topic=0.25):
+    """ Writes a digitally-born book of pages of random text, topic is the share of category words """
+    doc = pymupdf.open()
+    for _ in range(pages):
+        text = ' '.join(rng.choice(words, 400) if rng.random() < topic else rng.choice(COMMON, 400))
+        doc.new_page().insert_textbox(pymupdf.Rect(40, 40, 560, 810), text, fontsize=8)
+    doc.save(path)
+    doc.close()
+
+def makeLibrary(folder, *, books=8, pages=60, seed=0):
+    """ Writes books textbooks per category, returns [(path, category)] """
+    rng = np.random.default_rng(seed)
+    library = []
+    for category, words in CATEGORIES.items():
+        for i in range(books):
+            path = os.path.join(folder, '{}_{}.pdf'.format(category, i))
+            makeTextbook(path, words, rng, pages=pages)
+            library.append((path, category))
+    return library
+
+def extractLibrary(library, max_tokens=None):
+    """ Reads every book, returns the texts, the seconds per book and the share of pages skipped """
+    texts = []
+    skipped = 0
+    pages = 0
+    start = time.perf_counter()
+    for path, _ in library:
+        collector = PdfDataCollector(path, pages=None, max_tokens=max_tokens)
+        texts.append(collector.text)
+        skipped += collector.stats['skipped_pages']
+        pages += collector.stats['pages']
+    return texts, (time.perf_counter() - start) / len(library), skipped / pages
+
+def classificationAccuracy(texts, labels, *, seed=0):
+    """ Accuracy of the tfidf + LinearSVC model of machine_learning_algorithms on a held out third """
+    from sklearn.model_selection import train_test_split
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.pipeline import make_pipeline
+    from sklearn.svm import LinearSVC
+
+    X_train, X_test, y_train, y_test = train_test_split(texts, labels, test_size=1 / 3, random_state=seed,
+                                                        stratify=labels)
+    model = make_pipeline(TfidfVectorizer(), LinearSVC())
+    model.fit(X_train, y_train)
+    return model.score(X_test, y_test)
+
+def time_it(*, books=8, pages=60, budgets=BUDGETS, seed=0, output=None):
+    """ timing the extraction and the accuracy for every budget """
+    folder = tempfile.mkdtemp(prefix='budget_benchmarks_')
+    try:
+        library = makeLibrary(folder, books=books, pages=pages, seed=seed)
+        labels = [category for _, category in library]
+        results = {}
+        for budget in budgets:
+            texts, seconds, skipped = extractLibrary(library, budget)
+            results[str(budget)] = {'seconds_per_book': seconds, 'skipped_pages': skipped,
+                                    'accuracy': classificationAccuracy(texts, labels, seed=seed)}
+    finally:
+        shutil.rmtree(folder)
+
+    full = results[str(budgets[0])]['seconds_per_book']
+    for budget, result in results.items():
+        print('max_tokens={:<6} {:>7.4f} s per book ({:.1f}x)  {:>4.0%} of the pages skipped  accuracy {:.3f}'.format(
+            budget, result['seconds_per_book'], full / result['seconds_per_book'], result['skipped_pages'],
+            result['accuracy']), file=sys.stderr)
+    if output is not None:
+        with open(output, 'w') as File:
+            json.dump(results, File, indent=2)
+    return results
+
+if __name__ == "__main__":
+    time_it()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Tue Oct 20 10:12:54 2026
+
+@author: ngoni97
+"""
+# どうもありがとうございます == Dōmo arigatōgozaimasu
+
+# fixed 300 dpi OCR against adaptive dpi (150 first, 300 only for the pages that read badly)
+# on a synthetic scanned corpus: the time per page and how many of the words are read back
+# python -m benchmarks.ocr_benchmarks (from Machine_Learning_Algorithms, needs tesseract)
+
+import os
+import re
+import sys
+import json
+import time
+import shutil
+import tempfile
+from collections import Counter
+
+import numpy as np
+import pymupdf
+
+from fixed_pdf_collector import PdfDataCollector
+from ocr_scheduler import configureScheduler
+
+WORDS = ('the quick brown fox jumps over lazy dog whilst integral of squared from zero to one equals '
+         'third matrix vector space linear algebra probability distribution theorem proof lemma').split()
+
+# font sizes of the pages, the small print is where 150 dpi isn't enough
+FONT_SIZES = (11, 11, 11, 9, 7, 5)
+
+def _pageText(rng, words=180):
+    """ A random paragraph of WORDS """
+    return ' '.join(rng.choice(WORDS, words))
+
+def makeScannedPdf(path, rng, *, pages=6, dpi=300, noise=12):
+    """ Writes a pdf of page images (no text layer), like a scanned book,
+        returns the words on every page
+    """
+    source = pymupdf.open()
+    scanned = pymupdf.open()
+    truth = []
+    for page_num in range(pages):
+        text = _pageText(rng)
+        truth.append(text.split())
+        page = source.new_page()
+        page.insert_textbox(pymupdf.Rect(50, 50, 550, 800), text, fontsize=FONT_SIZES[page_num % len(FONT_SIZES)])
+        pix = page.get_pixmap(dpi=dpi, colorspace=pymupdf.csGRAY, alpha=False)
+        image = np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.stride)[:, :pix.width]
+        # scanner noise
+        image = np.clip(image + rng.normal(0, noise, image.shape), 0, 255).astype(np.uint8)
+        noisy = pymupdf.Pixmap(pymupdf.csGRAY, pix.width, pix.height, image.tobytes(), False)
+        scanned.new_page(width=page.rect.width, height=page.rect.height).insert_image(page.rect, pixmap=noisy)
+    scanned.save(path, deflate=True)
+    scanned.close()
+    source.close()
+    return truth
+
+def makeScannedCorpus(folder, *, count=4, pages=6, seed=0):
+    """ Writes count scanned pdfs, returns {path: words of every page} """
+    rng = np.random.default_rng(seed)
+    corpus = {}
+    for i in range(count):
+        path = os.path.join(folder, 'scanned_{}.pdf'.format(i))
+        corpus[path] = makeScannedPdf(path, rng, pages=pages)
+    return corpus
+
+def wordRecall(truth, text):
+    """ Share of the true words found in the OCR text (each one counted as often as it occurs) """
+    expected = Counter(word for page in truth for word in page)
+    found = Counter(re.findall('[a-z]+', text.lower()))
+    return sum((expected & found).values()) / max(sum(expected.values()), 1)
+
+def benchmarkOcr(corpus, **options):
+    """ Reads the corpus with PdfDataCollector(**options),
+        returns the seconds per page, the word recall and the dpi chosen for every page
+    """
+    seconds = 0.0
+    recall = []
+    dpis = []
+    for path, truth in corpus.items():
+        start = time.perf_counter()
+        collector = PdfDataCollector(path, pages=None, **options)
+        seconds += time.perf_counter() - start
+        recall.append(wordRecall(truth, collector.text))
+        dpis.extend(collector.stats.get('ocr_dpi', {}).values())
+    pages = sum(len(truth) for truth in corpus.values())
+    return {'seconds_per_page': seconds / pages, 'recall': sum(recall) / len(recall),
+            'dpi': dict(Counter(dpis))}
+
+def time_it(*, count=4, pages=6, seed=0, output=None):
+    """ timing fixed against adaptive dpi OCR """
+    # one OCR thread, so the time per page isn't hidden by the number of cores
+    configureScheduler(1)
+    folder = tempfile.mkdtemp(prefix='ocr_benchmarks_')
+    try:
+        corpus = makeScannedCorpus(folder, count=count, pages=pages, seed=seed)
+        results = {
+            'fixed': benchmarkOcr(corpus, dpi=300),
+            'adaptive': benchmarkOcr(corpus, dpi=300, adaptive_dpi=True),
+        }
+    finally:
+        shutil.rmtree(folder)
+
+    for name, result in results.items():
+        print('{:<9} {:>7.3f} s per page  recall {:.3f}  dpi per page {}'.format(
+            name, result['seconds_per_page'], result['recall'], result['dpi']), file=sys.stderr)
+    fixed, adaptive = results['fixed'], results['adaptive']
+    print('cpu saved {:.0%}, recall lost {:.3f}'.format(
+        1 - adaptive['seconds_per_page'] / fixed['seconds_per_page'], fixed['recall'] - adaptive['recall']),
+        file=sys.stderr)
+    if output is not None:
+        with open(output, 'w') as File:
+            json.dump(results, File, indent=2)
+    return results
+
+if __name__ == "__main__":
+    time_it()
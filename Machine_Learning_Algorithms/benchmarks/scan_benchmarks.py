@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 19:31:12 2026
+
+@author: ngoni97
+"""
+# どうもありがとうございます == Dōmo arigatōgozaimasu
+
+# times the filesystem scanning code on the synthetic trees and writes the results
+# as json, so the numbers of two commits can be compared with compareResults()
+
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import tempfile
+import statistics
+import subprocess
+
+from folder_iterator_class import FolderIterator, scanFolders
+from file_extension_tester import listDirFiles
+from stripping_file_types import fileExtensionStripper
+from dataset_collector_saver_class import LoadDataset
+from collecting_data import CollectingData
+
+from benchmarks.synthetic_trees import TREES, makeTree
+
+def _timeIt(function, repeat):
+    """ Runs function repeat times, returns the best, median and every run in seconds """
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        runs.append(time.perf_counter() - start)
+    return {'best': min(runs), 'median': statistics.median(runs), 'runs': runs}
+
+def benchmarkTree(top, *, repeat=3, workers=8, stats_file=os.devnull):
+    """ Times every scanner on one tree, returns {benchmark name: timings}
+
+        listDirFiles and fileExtensionStripper are run on every folder of the tree,
+        CollectingData on the largest folder (the way the GUI uses it)
+    """
+    folders = [(dir_path, len(files)) for dir_path, files in scanFolders(top)]
+    largest = max(folders, key=lambda folder: folder[1])[0]
+
+    benchmarks = {
+        'FolderIterator': lambda: FolderIterator(top),
+        'FolderIterator(workers={})'.format(workers): lambda: FolderIterator(top, workers=workers),
+        'listDirFiles': lambda: [listDirFiles(dir_path) for dir_path, _ in folders],
+        'fileExtensionStripper': lambda: [fileExtensionStripper(dir_path) for dir_path, _ in folders],
+        'LoadDataset': lambda: LoadDataset(top),
+        'CollectingData': lambda: CollectingData(largest, stats_file=stats_file),
+    }
+    # one untimed run first, so every benchmark starts with a warm page cache
+    for function in benchmarks.values():
+        function()
+    return {name: _timeIt(function, repeat) for name, function in benchmarks.items()}
+
+def _gitCommit():
+    """ The commit being benchmarked, None outside a git checkout """
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def runBenchmarks(*, trees=tuple(TREES), scale=1.0, repeat=3, workers=8, seed=0, output=None, keep=False):
+    """ Builds the trees in a temp dir, times them and returns the results as a dict,
+        also written to output as json when given
+    """
+    results = {
+        'commit': _gitCommit(),
+        'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'scale': scale,
+        'repeat': repeat,
+        'seed': seed,
+        'trees': {},
+    }
+    root = tempfile.mkdtemp(prefix='scan_benchmarks_')
+    try:
+        for name in trees:
+            start = time.perf_counter()
+            top, folders, files = makeTree(name, root, scale=scale, seed=seed)
+            print('{}: {} folders, {} files (built in {:.1f} s)'.format(
+                name, folders, files, time.perf_counter() - start), file=sys.stderr)
+            timings = benchmarkTree(top, repeat=repeat, workers=workers)
+            for benchmark, timing in timings.items():
+                print('    {:<28} {:>9.4f} s'.format(benchmark, timing['best']), file=sys.stderr)
+            results['trees'][name] = {'folders': folders, 'files': files, 'results': timings}
+    finally:
+        if keep:
+            print('trees kept in', root, file=sys.stderr)
+        else:
+            shutil.rmtree(root)
+
+    if output is not None:
+        with open(output, 'w') as File:
+            json.dump(results, File, indent=2)
+    return results
+
+def compareResults(old, new, *, threshold=1.10):
+    """ Compares two result files (paths or dicts) by the best times
+
+        returns [(tree, benchmark, old, new, ratio)] and prints them,
+        a ratio above threshold is marked as a regression
+    """
+    if isinstance(old, str):
+        with open(old) as File:
+            old = json.load(File)
+    if isinstance(new, str):
+        with open(new) as File:
+            new = json.load(File)
+
+    rows = []
+    for tree, data in new['trees'].items():
+        old_results = old['trees'].get(tree, {}).get('results', {})
+        for benchmark, timing in data['results'].items():
+            if benchmark not in old_results:
+                continue
+            before, after = old_results[benchmark]['best'], timing['best']
+            ratio = after / before if before else float('inf')
+            rows.append((tree, benchmark, before, after, ratio))
+            print('{:<6} {:<28} {:>9.4f} s -> {:>9.4f} s  {:>5.2f}x{}'.format(
+                tree, benchmark, before, after, ratio, '  REGRESSION' if ratio > threshold else ''))
+    return rows
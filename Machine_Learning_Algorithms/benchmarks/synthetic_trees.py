@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 19:04:51 2026
+
+@author: ngoni97
+"""
+# どうもありがとうございます == Dōmo arigatōgozaimasu
+
+# synthetic directory trees for the benchmarks, the same seed always builds the same tree
+# so the timings of different commits are measured on identical inputs
+
+import os
+import random
+
+from file_extension_tester import EXTENSION_TABLE
+
+# every listed extension plus a few that the table can't place
+EXTENSIONS = sorted(EXTENSION_TABLE) + ['.bak', '.tmp', '.xyz', '']
+# folder names of the mixed tree, the same name appears at different levels
+# like the subject folders of a real library
+SUBJECTS = ['MATHEMATICS', 'PHYSICS', 'CHEMISTRY', 'BIOLOGY', 'COMPUTER SCIENCE',
+            'ENGINEERING', 'ECONOMICS', 'HISTORY', 'Music', 'Videos', 'Pictures', 'Downloads']
+
+def _fileName(rng, i):
+    """ A random looking file name with one of the EXTENSIONS """
+    words = rng.choice(['notes', 'Lecture', 'chapter', 'intro_to', 'Advanced-', 'draft', 'final v2'])
+    return '{} {}_{}{}'.format(words, i, rng.randrange(10 ** 6), rng.choice(EXTENSIONS))
+
+def _makeFiles(folder, count, rng, start=0):
+    """ Creates count empty files inside folder """
+    for i in range(start, start + count):
+        open(os.path.join(folder, _fileName(rng, i)), 'w').close()
+
+def makeFlatTree(root, *, files=100_000, seed=0):
+    """ One folder holding all the files, returns (folders, files) """
+    rng = random.Random(seed)
+    folder = os.path.join(root, 'flat')
+    os.mkdir(folder)
+    _makeFiles(folder, files, rng)
+    return 1, files
+
+def makeDeepTree(root, *, folders=10_000, branching=4, files_per_folder=3, seed=0):
+    """ folders nested breadth first with branching sub folders each,
+        every folder has a unique name, returns (folders, files)
+    """
+    rng = random.Random(seed)
+    top = os.path.join(root, 'deep')
+    os.mkdir(top)
+    queue = [top]
+    made = 1
+    _makeFiles(top, files_per_folder, rng)
+    # a list used as a queue, index instead of pop(0)
+    i = 0
+    while made < folders:
+        parent = queue[i]
+        i += 1
+        for _ in range(branching):
+            if made >= folders:
+                break
+            folder = os.path.join(parent, 'folder_{}'.format(made))
+            os.mkdir(folder)
+            _makeFiles(folder, files_per_folder, rng)
+            queue.append(folder)
+            made += 1
+    return made, made * files_per_folder
+
+def makeMixedTree(root, *, folders=500, files=20_000, max_depth=6, seed=0):
+    """ Randomly nested subject folders with an uneven number of files each,
+        returns (folders, files)
+    """
+    rng = random.Random(seed)
+    top = os.path.join(root, 'mixed')
+    os.mkdir(top)
+    all_folders = [(top, 0)]
+    while len(all_folders) < folders:
+        parent, depth = rng.choice(all_folders)
+        if depth >= max_depth:
+            continue
+        folder = os.path.join(parent, '{} {}'.format(rng.choice(SUBJECTS), rng.randrange(folders)))
+        if os.path.exists(folder):
+            continue
+        os.mkdir(folder)
+        all_folders.append((folder, depth + 1))
+
+    # a few large folders and many small ones
+    weights = [rng.paretovariate(1.2) for _ in all_folders]
+    for i, (folder, _) in enumerate(rng.choices(all_folders, weights, k=files)):
+        open(os.path.join(folder, _fileName(rng, i)), 'w').close()
+    return len(all_folders), files
+
+# name -> (builder, default keyword arguments), the sizes are multiplied by the scale
+TREES = {
+    'flat': (makeFlatTree, {'files': 100_000}),
+    'deep': (makeDeepTree, {'folders': 10_000}),
+    'mixed': (makeMixedTree, {'folders': 500, 'files': 20_000}),
+}
+
+def makeTree(name, root, *, scale=1.0, seed=0):
+    """ Builds one of the TREES inside root, returns (top folder, folders, files) """
+    builder, sizes = TREES[name]
+    sizes = {key: max(1, int(value * scale)) for key, value in sizes.items()}
+    folders, files = builder(root, seed=seed, **sizes)
+    return os.path.join(root, name), folders, files
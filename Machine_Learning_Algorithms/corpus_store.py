@@ -0,0 +1,406 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Wed Oct 21 09:26:47 2026
+
+@author: ngoni97
+"""
+# どうもありがとうございます == Dōmo arigatōgozaimasu
+
+# the extracted text of every book in a few large append-only files instead of one .txt per book,
+# 50k books were 50k files written by the collectors and 50k files opened again by RUNMODEL,
+# here the records are zlib compressed, appended to shard files of ~64 MB and found through
+# an sqlite index of (document id -> shard, offset, length)
+#
+# a record is only written to the index once it is completely on disk, a crash in between
+# leaves bytes past the last indexed record of the shard which are cut off when the store is opened again
+#
+# a document stored again with the same text isn't appended a second time, one stored with a new
+# text leaves its old record behind in the shard until compact() rewrites the live records
+
+import os
+import time
+import zlib
+import struct
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+# the lock between the processes writing to the same store, fcntl doesn't exist on windows
+if os.name == 'nt':
+    import msvcrt
+
+    def _lockFile(file):
+        file.seek(0)
+        while True:
+            try:
+                # LK_LOCK gives up after 10 attempts a second apart
+                msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                continue
+
+    def _unlockFile(file):
+        file.seek(0)
+        msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+else:
+    import fcntl
+
+    def _lockFile(file):
+        fcntl.flock(file, fcntl.LOCK_EX)
+
+    def _unlockFile(file):
+        fcntl.flock(file, fcntl.LOCK_UN)
+
+# without O_BINARY windows opens the shards in text mode
+_BINARY = getattr(os, 'O_BINARY', 0)
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS documents (
+    id          TEXT PRIMARY KEY,
+    category    TEXT,
+    shard       INTEGER NOT NULL,
+    offset      INTEGER NOT NULL,
+    length      INTEGER NOT NULL
+);
+'''
+
+# magic, length of the id, length of the compressed text, crc32 of the compressed text
+RECORD_HEADER = struct.Struct('<4sHII')
+RECORD_MAGIC = b'CRP1'
+SHARD_SIZE = 64 * 1024 ** 2
+
+class CorpusStoreError(Exception):
+    """ A record that doesn't match its index entry """
+
+
+class CorpusStore():
+    """
+    Compressed text of documents kept in sharded record files with an sqlite offset index
+
+    put() appends a document (a document stored again replaces the old one in the index),
+    get() reads one back by id, iterDocuments() streams them in the order they are on disk,
+    compact() drops the records that were replaced,
+    several processes can write to the same store, the appends take turns on a file lock
+    """
+    def __init__(self, root, *, shard_size=SHARD_SIZE, level=6, durable=False):
+        self.root = root
+        self.shard_size = shard_size
+        # zlib compression level
+        self.level = level
+        # durable=True fsyncs every record before it's indexed, slower but survives a power cut
+        self.durable = durable
+        os.makedirs(self.root, exist_ok=True)
+
+        self.connection = sqlite3.connect(os.path.join(self.root, 'index.sqlite'), timeout=60,
+                                          check_same_thread=False)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        if not self.durable:
+            # the commits aren't synced, a crash can lose the last records but never corrupt the index
+            self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.executescript(_SCHEMA)
+        # one writer thread at a time in this process, the file lock is for the other processes
+        self._lock = threading.Lock()
+        self._lock_file = open(os.path.join(self.root, 'lock'), 'a')
+        # shard number -> file descriptor opened for reading
+        self._readers = {}
+        # the seek + read of _pread() where there is no os.pread (windows)
+        self._read_lock = threading.Lock()
+
+        with self._locked():
+            self._truncateOrphans()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    def __contains__(self, doc_id):
+        return self.connection.execute("SELECT 1 FROM documents WHERE id = ?", (doc_id,)).fetchone() is not None
+
+    def close(self):
+        """ Closes the index and the shard files """
+        for fd in self._readers.values():
+            os.close(fd)
+        self._readers.clear()
+        self._lock_file.close()
+        self.connection.close()
+
+    def _shardPath(self, shard):
+        return os.path.join(self.root, 'shard-{:05d}.rec'.format(shard))
+
+    def _shards(self):
+        """ The numbers of the shard files on disk, in order """
+        return sorted(int(name[6:11]) for name in os.listdir(self.root)
+                      if name.startswith('shard-') and name.endswith('.rec'))
+
+    @contextmanager
+    def _locked(self):
+        """ The process and thread locks around a write """
+        with self._lock:
+            _lockFile(self._lock_file)
+            try:
+                yield
+            finally:
+                _unlockFile(self._lock_file)
+
+    def _truncateOrphans(self):
+        """ Cuts every shard back to the end of its last indexed record,
+            the shards without any indexed record (e.g. left by compact()) are removed
+        """
+        ends = dict(self.connection.execute("SELECT shard, MAX(offset + length) FROM documents GROUP BY shard"))
+        for shard in self._shards():
+            path = self._shardPath(shard)
+            end = ends.get(shard, 0)
+            if end == 0:
+                try:
+                    os.remove(path)
+                except OSError:
+                    # still open elsewhere (windows), removed the next time the store is opened
+                    pass
+            elif os.path.getsize(path) > end:
+                os.truncate(path, end)
+
+    def _writableShard(self):
+        """ The shard to append to: the last one, or a new one once it's full """
+        shards = self._shards()
+        shard = shards[-1] if shards else 0
+        if shards and os.path.getsize(self._shardPath(shard)) >= self.shard_size:
+            shard += 1
+        return shard
+
+    def _stored(self, doc_id, record):
+        """ True if doc_id is already stored as exactly the same record """
+        row = self.connection.execute(
+            "SELECT shard, offset, length FROM documents WHERE id = ?", (doc_id,)).fetchone()
+        if row is None or row[2] != len(record):
+            return False
+        shard, offset, _ = row
+        try:
+            # the whole record is compared, an equal crc32 doesn't make it the same text
+            return self._pread(shard, len(record), offset) == record
+        except OSError:
+            return False
+
+    def put(self, doc_id, text, category=None):
+        """ Appends a document, it replaces any document stored under the same id
+
+            a document that is already stored with the same text isn't appended again
+        """
+        key = doc_id.encode('utf-8')
+        payload = zlib.compress(text.encode('utf-8'), self.level)
+        record = RECORD_HEADER.pack(RECORD_MAGIC, len(key), len(payload), zlib.crc32(payload)) + key + payload
+
+        with self._locked():
+            if self._stored(doc_id, record):
+                with self.connection:
+                    self.connection.execute("UPDATE documents SET category = ? WHERE id = ?", (category, doc_id))
+                return
+            shard = self._writableShard()
+            fd = os.open(self._shardPath(shard), os.O_WRONLY | os.O_APPEND | os.O_CREAT | _BINARY, 0o644)
+            try:
+                offset = os.fstat(fd).st_size
+                # one write of the whole record, os.write can return early for a huge one
+                view = memoryview(record)
+                while view:
+                    view = view[os.write(fd, view):]
+                if self.durable:
+                    os.fsync(fd)
+            finally:
+                os.close(fd)
+            # the record only exists once it's in the index
+            with self.connection:
+                self.connection.execute("INSERT OR REPLACE INTO documents VALUES (?, ?, ?, ?, ?)",
+                                        (doc_id, category, shard, offset, len(record)))
+
+    def compact(self):
+        """ Rewrites the live records into new shards and removes the old shards,
+            returns the number of bytes freed
+
+            the new shards are indexed in one transaction before the old ones are removed,
+            a crash in between leaves shards without indexed records, which are removed
+            when the store is opened again
+        """
+        with self._locked():
+            old_shards = self._shards()
+            before = sum(os.path.getsize(self._shardPath(shard)) for shard in old_shards)
+            rows = self.connection.execute(
+                "SELECT id, shard, offset, length FROM documents ORDER BY shard, offset").fetchall()
+
+            # (new shard, new offset, id) of every record
+            moved = []
+            shard = old_shards[-1] if old_shards else -1
+            source, current = None, None
+            target, size = None, 0
+            try:
+                for doc_id, old_shard, offset, length in rows:
+                    if old_shard != current:
+                        if source is not None:
+                            source.close()
+                        source, current = open(self._shardPath(old_shard), 'rb', buffering=1024 ** 2), old_shard
+                    if source.tell() != offset:
+                        source.seek(offset)
+                    if target is None or size >= self.shard_size:
+                        if target is not None:
+                            self._closeShard(target)
+                        shard += 1
+                        target, size = open(self._shardPath(shard), 'wb', buffering=1024 ** 2), 0
+                    target.write(source.read(length))
+                    moved.append((shard, size, doc_id))
+                    size += length
+            finally:
+                if source is not None:
+                    source.close()
+                if target is not None:
+                    self._closeShard(target)
+
+            with self.connection:
+                self.connection.executemany("UPDATE documents SET shard = ?, offset = ? WHERE id = ?", moved)
+            for fd in self._readers.values():
+                os.close(fd)
+            self._readers.clear()
+            # the old shards have no indexed records left
+            self._truncateOrphans()
+            return before - sum(os.path.getsize(self._shardPath(shard)) for shard in self._shards())
+
+    def _closeShard(self, file):
+        """ Closes a shard written by compact(), synced with durable=True """
+        file.flush()
+        if self.durable:
+            os.fsync(file.fileno())
+        file.close()
+
+    def _reader(self, shard):
+        fd = self._readers.get(shard)
+        if fd is None:
+            fd = self._readers[shard] = os.open(self._shardPath(shard), os.O_RDONLY | _BINARY)
+        return fd
+
+    def _pread(self, shard, length, offset):
+        """ length bytes of a shard at offset """
+        fd = self._reader(shard)
+        if hasattr(os, 'pread'):
+            return os.pread(fd, length, offset)
+        with self._read_lock:
+            os.lseek(fd, offset, os.SEEK_SET)
+            return os.read(fd, length)
+
+    @staticmethod
+    def _decode(doc_id, record):
+        """ Checks a record against its id and returns its text """
+        magic, key_length, payload_length, crc = RECORD_HEADER.unpack_from(record)
+        start = RECORD_HEADER.size + key_length
+        payload = record[start:start + payload_length]
+        if (magic != RECORD_MAGIC or record[RECORD_HEADER.size:start] != doc_id.encode('utf-8')
+                or len(payload) != payload_length or zlib.crc32(payload) != crc):
+            raise CorpusStoreError('corrupt record for {}'.format(doc_id))
+        return zlib.decompress(payload).decode('utf-8')
+
+    def get(self, doc_id, default=None):
+        """ The text of a document, default if it isn't in the store """
+        row = self.connection.execute(
+            "SELECT shard, offset, length FROM documents WHERE id = ?", (doc_id,)).fetchone()
+        if row is None:
+            return default
+        shard, offset, length = row
+        return self._decode(doc_id, self._pread(shard, length, offset))
+
+    def ids(self, category=None):
+        """ The document ids, of one category or all of them """
+        if category is None:
+            return [row[0] for row in self.connection.execute("SELECT id FROM documents")]
+        return [row[0] for row in self.connection.execute("SELECT id FROM documents WHERE category = ?", (category,))]
+
+    def categories(self):
+        """ The categories of the documents """
+        return [row[0] for row in self.connection.execute("SELECT DISTINCT category FROM documents")]
+
+    def iterDocuments(self, category=None):
+        """ Generator of (id, category, text) in the order they are on disk,
+            one shard after the other read front to back
+        """
+        query = "SELECT id, category, shard, offset, length FROM documents"
+        parameters = ()
+        if category is not None:
+            query += " WHERE category = ?"
+            parameters = (category,)
+        rows = self.connection.execute(query + " ORDER BY shard, offset", parameters).fetchall()
+
+        file, current = None, None
+        try:
+            for doc_id, doc_category, shard, offset, length in rows:
+                if shard != current:
+                    if file is not None:
+                        file.close()
+                    file, current = open(self._shardPath(shard), 'rb', buffering=1024 ** 2), shard
+                if file.tell() != offset:
+                    file.seek(offset)
+                yield doc_id, doc_category, self._decode(doc_id, file.read(length))
+        finally:
+            if file is not None:
+                file.close()
+
+
+def time_it(count=5000, words=2000):
+    """ timing a .txt file per document against the store, writing and reading everything back """
+    import random
+    import shutil
+    import tempfile
+
+    rng = random.Random(0)
+    vocabulary = 'theorem proof lemma integral matrix vector energy particle cell protein gene'.split()
+    texts = [' '.join(rng.choice(vocabulary) for _ in range(words)) for _ in range(count)]
+    root = tempfile.mkdtemp(prefix='corpus_store_')
+    try:
+        folder = os.path.join(root, 'Saved_Text_Files')
+        os.makedirs(folder)
+        start = time.perf_counter()
+        for i, text in enumerate(texts):
+            with open(os.path.join(folder, 'book_{}.txt'.format(i)), 'w', encoding='utf-8') as File:
+                File.write(text)
+        write_files = time.perf_counter() - start
+        start = time.perf_counter()
+        read = []
+        for name in os.listdir(folder):
+            with open(os.path.join(folder, name), 'r') as File:
+                read.append(File.read())
+        read_files = time.perf_counter() - start
+
+        start = time.perf_counter()
+        with CorpusStore(os.path.join(root, 'store')) as store:
+            for i, text in enumerate(texts):
+                store.put('book_{}'.format(i), text, 'category_{}'.format(i % 4))
+        write_store = time.perf_counter() - start
+        start = time.perf_counter()
+        with CorpusStore(os.path.join(root, 'store')) as store:
+            streamed = [text for _, _, text in store.iterDocuments()]
+        read_store = time.perf_counter() - start
+        assert sorted(streamed) == sorted(read)
+
+        # random access to a tenth of the documents
+        sample = rng.sample(range(count), count // 10)
+        start = time.perf_counter()
+        for i in sample:
+            with open(os.path.join(folder, 'book_{}.txt'.format(i)), 'r') as File:
+                File.read()
+        get_files = time.perf_counter() - start
+        with CorpusStore(os.path.join(root, 'store')) as store:
+            start = time.perf_counter()
+            assert all(store.get('book_{}'.format(i)) == texts[i] for i in sample)
+            get_store = time.perf_counter() - start
+
+        size = sum(os.path.getsize(os.path.join(root, 'store', name)) for name in os.listdir(os.path.join(root, 'store')))
+        print('{} documents of {} words'.format(count, words))
+        print('.txt files: write {:.3f} s  read {:.3f} s  {} random reads {:.3f} s  {:.1f} MB in {} files'.format(
+            write_files, read_files, len(sample), get_files, sum(len(text) for text in texts) / 1024 ** 2, count))
+        print('store:      write {:.3f} s  read {:.3f} s  {} random reads {:.3f} s  {:.1f} MB in {} files'.format(
+            write_store, read_store, len(sample), get_store, size / 1024 ** 2, len(os.listdir(os.path.join(root, 'store')))))
+    finally:
+        shutil.rmtree(root)
+
+if __name__ == "__main__":
+    time_it()
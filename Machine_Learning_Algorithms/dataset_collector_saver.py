@@ -13,35 +13,16 @@ Created on Sun Jan 19 03:11:09 2025
 # e.g., 'my_file.pdf' should be saved as 'my_file'
 
 import os
-import re
+import string
 from file_extension_tester import listDirFiles
+from folder_iterator_class import FolderIterator
 
-tar_names = []
-directory_path_names = []
-def TargetNames(parent_path, *, target_names=[], direct):
+def TargetNames(parent_path, *, workers=8):
     ''' collects folder names and use them as target names '''
-    tar_names = []
-    directory_path_names = []
-    # continue iterating until it reaches the last folder that doesn't contain any
-    # other folders
-    
-    ''' Iterates through directories and returns folder names '''
-    for folder in os.listdir(parent_path):
-        # if it contains only files then append the folder name
-        Path = os.path.join(parent_path, folder)
-        if os.path.isdir(Path):
-                TargetNames(Path)
-        else:
-             # base case
-             if os.path.isfile(Path):
-                 Folder = os.path.basename(os.path.dirname(Path))
-                 if Folder in tar_names:
-                     pass
-                 else:
-                     tar_names.append(Folder)
-                     directory_path_names.append(os.path.dirname(Path))
-
-    return tar_names, directory_path_names
+    # the folders are listed by a pool of threads, the archives are on a slow
+    # external mount where every listdir waits on the disk
+    folders = FolderIterator(parent_path, workers=workers)
+    return folders.categories, folders.directory_path_names
 
 def Dataset(Directory, *, _dict=False, folder_name=False):
     """ collects files from a specific directory
@@ -178,15 +159,21 @@ def SpecificDataset(directory, *, tar_names=None, Type=None, rmChar=False):
         return Executable
         pass
 
+# the file name cleaner has its own tables, text_normalisation.cleanText would drop the digits
+# and split "file's" and "e.g." on the punctuation, which changes the features of the file names
+_SPECIAL_CHARACTERS = '?|$&*%@()~'
+# keep_apostrophes: '_' and '-' to spaces and the special characters removed, everything else is kept
+_KEEP_TABLE = str.maketrans('_-', '  ', _SPECIAL_CHARACTERS)
+# otherwise only the letters, digits and spaces are kept ('_' and '-' become spaces)
+_ALPHANUMERIC = set(string.ascii_letters + string.digits + ' _-')
+_ALPHANUMERIC_TABLE = bytes.maketrans(b'_-' + string.ascii_uppercase.encode(), b'  ' + string.ascii_lowercase.encode())
+_NON_ALPHANUMERIC = bytes(byte for byte in range(256) if chr(byte) not in _ALPHANUMERIC)
+
 def remove_characters_before_tokenization(sentence,keep_apostrophes=False):
-    sentence = (sentence.replace('_', ' ')).replace('-', ' ')
     if keep_apostrophes:
-        PATTERN = r'[?|$|&|*|%|@|(|)|~]' # add other characters here to remove them
-        filtered_sentence = re.sub(PATTERN, r'', sentence)
-    else:
-        PATTERN = r'[^a-zA-Z0-9 ]' # only extract alpha-numeric characters
-        filtered_sentence = re.sub(PATTERN, r'', sentence)
-    return filtered_sentence.lower()
+        return sentence.translate(_KEEP_TABLE).lower()
+    # the non ascii characters are removed by the encoding, the rest in one bytes.translate
+    return sentence.encode('ascii', 'ignore').translate(_ALPHANUMERIC_TABLE, _NON_ALPHANUMERIC).decode('ascii')
 
 if __name__ == "__main__":
     print(""" this is a module run directly\n\n""")
@@ -8,16 +8,24 @@ Created on Sun Jan 26 01:36:21 2025
 # どうもありがとうございます == Dōmo arigatōgozaimasu
 
 import os
-import re
+import string
 import numpy as np
 from collections import OrderedDict
 from collections.abc import Iterable
 
 from folder_iterator_class import FolderIterator
-from stripping_file_types import fileExtensionStripper
+from stripping_file_types import stripFileNames
+
+# the file name cleaner has its own tables, text_normalisation.cleanText would
+# give the file names different tokens and so change the features built from them
+_SPECIAL_CHARACTERS_TABLE = str.maketrans('', '', '?|$&*%@()~')
+# letters to lower case, every other byte to a space
+_LETTERS_TABLE = bytes(ord(chr(byte).lower()) if chr(byte) in string.ascii_letters else ord(' ')
+                       for byte in range(256))
+_NON_ALPHANUMERIC = bytes(byte for byte in range(256) if chr(byte) not in string.ascii_letters + string.digits)
 
 class LoadDataset(object):
-    def __init__(self, directory,*,tar_names=None,Type=None,rmChar=False,_dict=False,folder_name=False):
+    def __init__(self, directory,*,tar_names=None,Type=None,rmChar=False,_dict=False,folder_name=False,index=None):
         self.directory = directory
         self._tar_names = tar_names
         self._Type = Type
@@ -30,7 +38,8 @@ class LoadDataset(object):
         self.Data = {}
         self.Documents, self.Images, self.Music, self.Videos, self.Programming, self.Executable = [],[],[],[],[],[]
         
-        self.folder = FolderIterator(self.directory, folder_name=self.__folder_name)
+        # walked lazily by __Dataset, the lists below fill up as the folders are found
+        self.folder = FolderIterator(self.directory, folder_name=self.__folder_name, lazy=True, index=index)
         self.categories = self.folder.returnCategories()
         self.dir_path_names = self.folder.returnDirPathNames()
         
@@ -46,8 +55,9 @@ class LoadDataset(object):
             strips the file type
             """
         
-        for path in self.dir_path_names:
-            Documents, Images, Music, Videos, Programming, Executable = fileExtensionStripper(path)
+        for path, files in self.folder.iterFolders():
+            # the walker has already listed the folder, strip the names in bulk
+            Documents, Images, Music, Videos, Programming, Executable = stripFileNames(files)
             
             if self.__folder_name == False:
                 if self.__dict == False:
@@ -175,17 +185,14 @@ class LoadDataset(object):
             pass
 
     def remove_characters_before_tokenization(self, sentence,keep_apostrophes=False):
-        sentence = (sentence.replace('_', ' ')).replace('-', ' ')
         if keep_apostrophes:
-            PATTERN = r'[?|$|&|*|%|@|(|)|~]' # add other characters here to remove them
-            pattern = re.compile('[^a-zA-Z]') # remove numbers
-            #filtered_sentence = re.sub(PATTERN, r' ', sentence)
-            filtered_sentence = re.sub(pattern, r' ', re.sub(PATTERN, r'', sentence))
-        else:
-            PATTERN = r'[^a-zA-Z0-9]' # only extract alpha-numeric characters
-            pattern = re.compile('[^a-zA-Z]') # remove numbers
-            filtered_sentence = re.sub(pattern, r' ', re.sub(PATTERN, r'', sentence))
-        return filtered_sentence.lower()
+            # the special characters are removed, every other character but the letters becomes a space
+            # (one per non ascii character, which the encoding turns into '?')
+            data = sentence.translate(_SPECIAL_CHARACTERS_TABLE).encode('ascii', 'replace')
+            return data.translate(_LETTERS_TABLE).decode('ascii')
+        # everything but the letters and digits is removed (spaces included) and the digits become spaces
+        data = sentence.encode('ascii', 'ignore')
+        return data.translate(_LETTERS_TABLE, _NON_ALPHANUMERIC).decode('ascii')
     
     def Flatten(self, items, ignore_types=(str, bytes)):
         """ Flattening a Nested Sequence
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 10:12:41 2026
+
+@author: ngoni97
+"""
+# どうもありがとうございます == Dōmo arigatōgozaimasu
+
+# persistent on-disk index of the folders and files that have already been scanned
+# a folder is only listed again when its own mtime has changed, adding, removing
+# or renaming a file inside a folder updates the folder's mtime
+
+import os
+import sqlite3
+import time
+
+from file_extension_tester import CATEGORIES, splitFileExtension, sniffFiles
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS folders (
+    path        TEXT PRIMARY KEY,
+    parent      TEXT,
+    mtime_ns    INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS folders_parent ON folders (parent);
+
+CREATE TABLE IF NOT EXISTS files (
+    path        TEXT PRIMARY KEY,
+    folder      TEXT NOT NULL,
+    name        TEXT NOT NULL,
+    size        INTEGER,
+    mtime_ns    INTEGER,
+    inode       INTEGER,
+    category    INTEGER
+);
+CREATE INDEX IF NOT EXISTS files_folder ON files (folder);
+'''
+
+def _subtreeRange(path):
+    """ (low, high) with low <= p < high for every path p below path
+
+        a range of the sorted paths rather than LIKE, LIKE ignores the case
+        of ascii letters so /x/Foo/% matched /x/foo/... as well
+    """
+    prefix = path.rstrip(os.sep)
+    return prefix + os.sep, prefix + chr(ord(os.sep) + 1)
+
+class DirectoryIndex():
+    """
+    An sqlite3 index of a directory tree keyed by path,
+    storing the size, mtime, inode and category of every file
+    """
+    def __init__(self, db_path='directory_index.sqlite'):
+        self.db_path = db_path
+        self.connection = sqlite3.connect(self.db_path)
+        self.connection.executescript(_SCHEMA)
+        # statistics of the last update() call
+        self.scanned_folders = 0
+        self.skipped_folders = 0
+
+    def close(self):
+        """ Closes the database connection """
+        self.connection.close()
+
+    def _knownFolders(self, root):
+        """ Returns {path: mtime_ns} and {parent: [children]} for root and everything below it """
+        rows = self.connection.execute(
+            "SELECT path, parent, mtime_ns FROM folders WHERE path = ? OR (path >= ? AND path < ?)",
+            (root, *_subtreeRange(root)))
+        mtimes, children = {}, {}
+        for path, parent, mtime_ns in rows:
+            mtimes[path] = mtime_ns
+            children.setdefault(parent, []).append(path)
+        return mtimes, children
+
+    def _forget(self, path):
+        """ Removes a folder and everything below it from the index """
+        low, high = _subtreeRange(path)
+        self.connection.execute(
+            "DELETE FROM folders WHERE path = ? OR (path >= ? AND path < ?)", (path, low, high))
+        self.connection.execute(
+            "DELETE FROM files WHERE folder = ? OR (folder >= ? AND folder < ?)", (path, low, high))
+
+    def _scanFolder(self, folder, mtime_ns, known_children):
+        """ Lists a single folder and replaces its rows, returns the sub folders """
+        rows = []
+        sub_folders = []
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        sub_folders.append(entry.path)
+                    elif entry.is_file():
+                        st = entry.stat()
+                        rows.append((entry.path, folder, entry.name, st.st_size, st.st_mtime_ns,
+                                     st.st_ino, splitFileExtension(entry.name)[1]))
+                except OSError:
+                    # removed whilst scanning
+                    continue
+
+        # files the extension table can't place are sniffed by their contents
+        unknown = [i for i, row in enumerate(rows) if row[6] is None]
+        if unknown:
+            for i, category in zip(unknown, sniffFiles([rows[i][0] for i in unknown])):
+                rows[i] = rows[i][:6] + (category,)
+
+        self.connection.execute("DELETE FROM files WHERE folder = ?", (folder,))
+        self.connection.executemany("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+        # sub folders that have disappeared since the last scan
+        for child in set(known_children).difference(sub_folders):
+            self._forget(child)
+        self.connection.execute("INSERT OR REPLACE INTO folders VALUES (?, ?, ?)",
+                                (folder, os.path.dirname(folder), mtime_ns))
+        return sub_folders
+
+    def update(self, root, *, recursive=True, full=False):
+        """ Brings the index up to date for root
+
+            folders whose mtime hasn't changed since they were last indexed are not listed again,
+            only stat()-ed, full=True rescans everything (e.g. to pick up files that were
+            modified in place, which doesn't change the folder's mtime)
+        """
+        root = os.path.abspath(root)
+        self.scanned_folders = 0
+        self.skipped_folders = 0
+        mtimes, children = self._knownFolders(root)
+
+        # one transaction for the whole walk
+        with self.connection:
+            stack = [root]
+            while stack:
+                folder = stack.pop()
+                try:
+                    mtime_ns = os.stat(folder).st_mtime_ns
+                except OSError:
+                    self._forget(folder)
+                    continue
+
+                known_children = children.get(folder, [])
+                if not full and mtimes.get(folder) == mtime_ns:
+                    self.skipped_folders += 1
+                    sub_folders = known_children
+                else:
+                    self.scanned_folders += 1
+                    try:
+                        sub_folders = self._scanFolder(folder, mtime_ns, known_children)
+                    except OSError:
+                        # unreadable folder
+                        self._forget(folder)
+                        continue
+                if recursive:
+                    stack.extend(sub_folders)
+        return self
+
+    def iterFolders(self, root):
+        """ Yields (dir_path, files) for every indexed folder below root that contains files
+
+            depth first and sorted by name, the same order as folder_iterator_class.scanFolders
+        """
+        root = os.path.abspath(root)
+        rows = self.connection.execute(
+            "SELECT folder, name FROM files WHERE folder = ? OR (folder >= ? AND folder < ?) "
+            "ORDER BY folder, name", (root, *_subtreeRange(root)))
+        folders = []
+        current, files = None, []
+        for folder, name in rows:
+            if folder != current:
+                if files:
+                    folders.append((current, files))
+                current, files = folder, []
+            files.append(name)
+        if files:
+            folders.append((current, files))
+        # sorted by path component, as text 'a-b' comes before 'a/c' but a's sub folders go first
+        folders.sort(key=lambda folder: folder[0].split(os.sep))
+        yield from folders
+
+    def categoryCounts(self, path):
+        """ Returns the number of files per category inside a single folder """
+        counts = [0] * len(CATEGORIES)
+        rows = self.connection.execute(
+            "SELECT category, COUNT(*) FROM files WHERE folder = ? AND category IS NOT NULL "
+            "GROUP BY category", (os.path.abspath(path),))
+        for category, count in rows:
+            counts[category] = count
+        return counts
+
+    def fileStats(self, path, *, full=False):
+        """ Returns [(name, category, size)] of the listed files inside a single folder,
+            the folder is refreshed first (listed again even if unchanged with full=True)
+        """
+        path = os.path.abspath(path)
+        self.update(path, recursive=False, full=full)
+        return self.connection.execute(
+            "SELECT name, category, size FROM files WHERE folder = ? AND category IS NOT NULL "
+            "ORDER BY rowid", (path,)).fetchall()
+
+    def listDirFiles(self, path, size=True, fullpath=False):
+        """ Same results as file_extension_tester.listDirFiles but read from the index,
+            the folder is refreshed first, which costs one stat() if it hasn't changed
+        """
+        path = os.path.abspath(path)
+        self.update(path, recursive=False)
+        if size == True:
+            return tuple(self.categoryCounts(path))
+
+        buckets = [[] for _ in CATEGORIES]
+        column = 'path' if fullpath else 'name'
+        rows = self.connection.execute(
+            "SELECT {}, category FROM files WHERE folder = ? AND category IS NOT NULL "
+            "ORDER BY rowid".format(column), (path,))
+        for name, category in rows:
+            buckets[category].append(name)
+        return buckets
+
+
+if __name__ == "__main__":
+    test_path = '/home/ngoni97/Documents'
+    index = DirectoryIndex()
+
+    start = time.perf_counter()
+    index.update(test_path)
+    print('first scan: {:.2f} s, {} folders listed'.format(time.perf_counter() - start, index.scanned_folders))
+
+    start = time.perf_counter()
+    index.update(test_path)
+    print('re-scan: {:.2f} s, {} folders listed, {} unchanged'.format(
+        time.perf_counter() - start, index.scanned_folders, index.skipped_folders))
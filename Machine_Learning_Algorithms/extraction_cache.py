@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 09:47:03 2026
+
+@author: ngoni97
+"""
+# どうもありがとうございます == Dōmo arigatōgozaimasu
+
+# on-disk cache of the extracted pdf text, so a pdf that hasn't changed is never read again
+# the text is stored by the content of the file (size + a hash of the first and last MB),
+# a renamed or copied book is still found, and a path whose size and mtime
+# haven't changed is found without opening the file at all
+
+import os
+import json
+import zlib
+import sqlite3
+import hashlib
+
+from text_normalisation import NORMALISER_VERSION
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS files (
+    path        TEXT PRIMARY KEY,
+    size        INTEGER NOT NULL,
+    mtime_ns    INTEGER NOT NULL,
+    digest      TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS texts (
+    digest      TEXT NOT NULL,
+    options     TEXT NOT NULL,
+    text        BLOB NOT NULL,
+    stats       TEXT,
+    PRIMARY KEY (digest, options)
+);
+'''
+
+# bytes hashed at each end of the file
+HASH_BYTES = 1024 ** 2
+
+def fileDigest(path, size):
+    """ Fast content hash: the size plus the first and last HASH_BYTES of the file """
+    digest = hashlib.blake2b(str(size).encode(), digest_size=16)
+    with open(path, 'rb') as file:
+        digest.update(file.read(HASH_BYTES))
+        if size > HASH_BYTES:
+            file.seek(max(size - HASH_BYTES, HASH_BYTES))
+            digest.update(file.read(HASH_BYTES))
+    return digest.hexdigest()
+
+def extractionOptions(pages, normalise, ocr='', budget='', mode='pages'):
+    """ The collector settings that change the text, part of the cache key
+
+        the normaliser version makes the texts cached by an older normaliseDocument misses
+    """
+    return 'pages={};normalise={};normaliser={};ocr={};budget={};mode={}'.format(
+        pages, bool(normalise), NORMALISER_VERSION if normalise else 0, ocr, budget, mode)
+
+
+class ExtractionCache():
+    """
+    An sqlite3 store of the cleaned text and the extraction stats of every pdf,
+    the text is zlib compressed
+
+    safe to share between the worker processes, each one opens its own connection
+    """
+    def __init__(self, db_path='extraction_cache.sqlite'):
+        self.db_path = db_path
+        # the workers write at the same time, wait for the lock instead of failing
+        self.connection = sqlite3.connect(self.db_path, timeout=60)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.executescript(_SCHEMA)
+        # statistics since the cache was opened
+        self.hits = 0
+        self.misses = 0
+        # (path, size, mtime_ns, digest) of the last miss, taken before the file is read and used
+        # by put(), only the last one is kept so misses that are never put() don't pile up
+        self._miss = None
+
+    def close(self):
+        """ Closes the database connection """
+        self.connection.close()
+
+    def _digest(self, path, st):
+        """ Returns (digest, fresh), fresh is False when the path's size and mtime are unchanged
+            and the digest was read from the index instead of the file
+        """
+        row = self.connection.execute(
+            "SELECT size, mtime_ns, digest FROM files WHERE path = ?", (path,)).fetchone()
+        if row is not None and row[0] == st.st_size and row[1] == st.st_mtime_ns:
+            return row[2], False
+        return fileDigest(path, st.st_size), True
+
+    def get(self, path, st, options):
+        """ Returns (text, stats) of a file or None if it hasn't been extracted with these options
+
+            st is the os.stat() of path, taken by the caller before reading the file
+        """
+        try:
+            digest, fresh = self._digest(path, st)
+        except OSError:
+            return None
+        row = self.connection.execute(
+            "SELECT text, stats FROM texts WHERE digest = ? AND options = ?", (digest, options)).fetchone()
+        if row is None:
+            self.misses += 1
+            self._miss = (path, st.st_size, st.st_mtime_ns, digest)
+            return None
+
+        self.hits += 1
+        if fresh:
+            # moved, copied or touched: same content under a new path or mtime
+            with self.connection:
+                self.connection.execute("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?)",
+                                        (path, st.st_size, st.st_mtime_ns, digest))
+        return zlib.decompress(row[0]).decode('utf-8'), json.loads(row[1] or '{}')
+
+    def put(self, path, st, options, text, stats=None):
+        """ Stores the text of a file, st is the os.stat() taken before the file was read
+            so a file modified whilst it was being read is read again next time
+        """
+        miss, self._miss = self._miss, None
+        digest = miss[3] if miss is not None and miss[:3] == (path, st.st_size, st.st_mtime_ns) else None
+        if digest is None:
+            try:
+                digest = fileDigest(path, st.st_size)
+            except OSError:
+                return
+        with self.connection:
+            self.connection.execute("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?)",
+                                    (path, st.st_size, st.st_mtime_ns, digest))
+            self.connection.execute("INSERT OR REPLACE INTO texts VALUES (?, ?, ?, ?)",
+                                    (digest, options, zlib.compress(text.encode('utf-8')),
+                                     json.dumps(stats or {})))
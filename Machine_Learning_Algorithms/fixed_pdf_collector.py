@@ -12,30 +12,104 @@ Created on Mon Jul  7 21:58:40 2025
 import os, re
 import pymupdf
 import nltk
-from threading import Thread, Lock
+from threading import Lock
+from bisect import bisect_right
 import time
 import cv2
-from pdf2image import convert_from_path
-from PIL import Image, ImageEnhance
+from PIL import Image
 import numpy as np
 import logging
 
+from extraction_cache import extractionOptions
+from ocr_scheduler import getScheduler
+from image_preprocessing import preprocessPage, threadBuffers
+from text_normalisation import cleanText, normaliseDocument
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# where the preprocessed page images are kept when save_images=True (unless images_folder is given)
+ENHANCED_IMAGES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                               'Test_Data', 'Enhanced_Images')
+
+# the nltk words corpus, False when it isn't installed, see loadVocabulary()
+_VOCABULARY = None
+VOWELS = re.compile('[aeiouy]')
+
+# outline entries of the front matter, the only pages read by toc_document()
+FRONT_MATTER = re.compile(r'\b(preface|foreword|introduction|abstract|summary|overview|prologue|about this book)\b',
+                          re.I)
+# pages read of every front matter section at most
+FRONT_MATTER_PAGES = 3
+
+def loadVocabulary():
+    """ The english word list used to judge OCR output, None if the nltk corpus isn't installed """
+    global _VOCABULARY
+    if _VOCABULARY is None:
+        try:
+            _VOCABULARY = frozenset(word.lower() for word in nltk.corpus.words.words())
+        except LookupError:
+            _VOCABULARY = False
+    return _VOCABULARY or None
+
+def wordRatio(text):
+    """ Share of the tokens of a cleaned OCR text that are real words, 0.0 for no text
+
+        mupdf's tesseract doesn't give out word confidences, so this stands in for them:
+        with the nltk words corpus a token has to be in the dictionary, without it a word
+        needs at least two letters and a vowel (bad OCR is mostly fragments and consonant runs)
+    """
+    tokens = text.split()
+    if not tokens:
+        return 0.0
+    vocabulary = loadVocabulary()
+    if vocabulary is not None:
+        words = sum(token in vocabulary for token in tokens)
+    else:
+        words = sum(1 for token in tokens if len(token) > 1 and VOWELS.search(token))
+    return words / len(tokens)
+
 class PdfDataCollector():
     """
     A class that takes in a pdf file and reads the text
     and saves it as a text file
     """
-    def __init__(self, file_path, pages=None, save_as_text_file=False, normalise=False, *, dpi=300, save_images=False):
+    def __init__(self, file_path, pages=None, save_as_text_file=False, normalise=False, *, dpi=300, save_images=False,
+                 cache=None, adaptive_dpi=False, low_dpi=150, min_word_ratio=0.75, max_tokens=None,
+                 max_characters=None, toc_first=False, store=None, max_memory=None, images_folder=None):
         self.file_path = file_path
         self.pages = pages
         self.save_as_text_file = save_as_text_file
         self.normalise = normalise
         self.dpi = dpi
         self.save_images = save_images
+        # save_images=True keeps the preprocessed pages in images_folder/<file name>/
+        self.images_folder = images_folder or ENHANCED_IMAGES
+        # adaptive_dpi=True OCRs every page at low_dpi first and only renders it again at dpi
+        # when less than min_word_ratio of the text are real words (see wordRatio)
+        self.adaptive_dpi = adaptive_dpi
+        self.low_dpi = low_dpi
+        self.min_word_ratio = min_word_ratio
+        # page number -> dpi the page was finally OCR-ed at
+        self.page_dpi = {}
+        # optional extraction_cache.ExtractionCache, unchanged files aren't read again
+        self.cache = cache
+        # optional corpus_store.CorpusStore, save_as_text_file=True puts the text there
+        # instead of writing a .txt file
+        self.store = store
+        # text budget: the reading (and OCR) stops once max_tokens words or max_characters
+        # characters of cleaned text have been collected, the classifier doesn't need whole books
+        self.max_tokens = max_tokens
+        self.max_characters = max_characters
+        # memory ceiling: at most max_memory bytes of cleaned text (ascii, a byte per character)
+        # are kept per document, the rest of a huge book isn't read
+        self.max_memory = max_memory
+        self._tokens = 0
+        self._characters = 0
+        # toc_first=True builds the text of a bookmarked document from its metadata, outline and
+        # front matter (see toc_document), the pages are only read when there's no outline
+        self.toc_first = toc_first
         
         self.file_name = os.path.basename(self.file_path)
         self.book_dict = {}
@@ -43,97 +117,188 @@ class PdfDataCollector():
         self.lock = Lock()
 
         # initialise
-        TEXT = self.get_document(self.file_path)
+        self.text = self.get_document(self.file_path)
         
     def remove_characters_before_tokenization(self, sentence,keep_apostrophes=False):
         """ remove characters and keeps words only"""
-        if not sentence:
-            return ""
-        # string
-        sentence = (sentence.replace('_', ' ')).replace('-', ' ')
-        PATTERN = re.compile('[?|$|&|*|%|@|(|)|~]')
-        pattern = re.compile('[^a-zA-Z]') if not keep_apostrophes else re.compile('[^a-zA-Z\']')
-        replacement = r' '
-        
-        filtered_sentence = re.sub(pattern, replacement, re.sub(PATTERN, replacement, sentence))
-        return ' '.join(filtered_sentence.lower().split())  # Remove extra spaces
+        return cleanText(sentence, keep_apostrophes)
 
     def normalize_document(self, doc):
         """ tokenize and remove stopwords """
-        # stopwords
-        roman_numerals = ['i', 'ii', 'iii', 'iv', 'v', 'vi', 'vii', 'viii', 'ix', 'x',
-                   'xi', 'xii', 'xiii', 'xiv', 'xv', 'xvi', 'xvii', 'xviii', 'xix', 'xx']
-        cardinals = ['nd', 'rd', 'th']
-        self.stop_words = nltk.corpus.stopwords.words('english')
-        self.stop_words = self.stop_words + list('qwertyuiopasdfghjklzxcvbnm') + roman_numerals + cardinals
-        self.wpt = nltk.WordPunctTokenizer()
-
-        # lower case and remove special characters\whitespaces
-        doc = re.sub(r'[^a-zA-Z0-9\s]', '', doc, re.I)
-        doc = doc.lower()
-        doc = doc.strip()
-        # tokenize document
-        tokens = self.wpt.tokenize(doc)
-        # filter stopwords out of document
-        filtered_tokens = [token for token in tokens if token not in self.stop_words]
-        # re-create document from filtered tokens
-        doc = ' '.join(filtered_tokens)
-        return doc
+        return normaliseDocument(doc)
 
     def advanced_image_preprocessing(self, image):
         """
         Advanced image preprocessing for better OCR results
+
+        takes a grayscale uint8 numpy array, which is preprocessed in place and returned,
+        or a PIL image, for which a PIL image is returned (see image_preprocessing)
         """
+        if isinstance(image, np.ndarray):
+            return preprocessPage(image, threadBuffers())
+
         # Convert to grayscale if needed
         if image.mode != 'L':
             image = image.convert('L')
-        
-        # Convert to numpy array
-        img_array = np.array(image)
-        
-        # 1. Noise reduction
-        img_array = cv2.medianBlur(img_array, 3)
-        
-        # 2. Gaussian blur to smooth
-        img_array = cv2.GaussianBlur(img_array, (1, 1), 0)
-        
-        # 3. Adaptive thresholding for better text separation
-        img_array = cv2.adaptiveThreshold(
-            img_array, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, 
-            cv2.THRESH_BINARY, 11, 2
-        )
-        
-        # 4. Morphological operations to clean up
-        kernel = np.ones((1, 1), np.uint8)
-        img_array = cv2.morphologyEx(img_array, cv2.MORPH_CLOSE, kernel)
-        img_array = cv2.morphologyEx(img_array, cv2.MORPH_OPEN, kernel)
-        
-        # Convert back to PIL Image
-        processed_image = Image.fromarray(img_array)
-        
-        # 5. PIL-specific enhancements
-        # Enhance contrast
-        enhancer = ImageEnhance.Contrast(processed_image)
-        processed_image = enhancer.enhance(1.2)
-        
-        # Enhance sharpness
-        enhancer = ImageEnhance.Sharpness(processed_image)
-        processed_image = enhancer.enhance(1.5)
-        
-        return processed_image
+        return Image.fromarray(preprocessPage(np.array(image), threadBuffers()))
     
+    def render_page(self, page, dpi=None):
+        """ Renders a pymupdf page straight into a grayscale uint8 numpy array, at self.dpi by default """
+        pix = page.get_pixmap(dpi=dpi or self.dpi, colorspace=pymupdf.csGRAY, alpha=False)
+        # one copy out of the pixmap's memory (freed along with pix) into a writable
+        # array the preprocessing can work on in place,
+        # the rows can be padded, stride is the length of a row in bytes
+        img_array = np.empty((pix.height, pix.width), dtype=np.uint8)
+        img_array[:] = np.frombuffer(pix.samples_mv, dtype=np.uint8).reshape(pix.height, pix.stride)[:, :pix.width]
+        return img_array
+
+    def ocr_image(self, img_array):
+        """ OCRs a grayscale image held in memory and returns its text """
+        img_array = np.ascontiguousarray(img_array)
+        height, width = img_array.shape
+        pix = pymupdf.Pixmap(pymupdf.csGRAY, width, height, img_array.tobytes(), False)
+        # mupdf's built in tesseract turns the image into a one page pdf with a text layer,
+        # which is opened from memory
+        with pymupdf.open('pdf', pix.pdfocr_tobytes()) as ocr_doc:
+            return ocr_doc[0].get_text()
+
+    def save_page_image(self, file_path, page_num, img_array, *, prefix='page'):
+        """ Keeps a preprocessed page as a png for checking the preprocessing (save_images=True) """
+        folder = os.path.join(self.images_folder, os.path.basename(file_path))
+        os.makedirs(folder, exist_ok=True)
+        cv2.imwrite(os.path.join(folder, f"{prefix}_{page_num + 1:04d}.png"), img_array)
+
+    def hasBudget(self):
+        """ True when max_tokens, max_characters or max_memory is set """
+        return self.max_tokens is not None or self._characterLimit() is not None
+
+    def _characterLimit(self):
+        """ The smaller of max_characters and max_memory, None without either """
+        limits = [limit for limit in (self.max_characters, self.max_memory) if limit is not None]
+        return min(limits) if limits else None
+
+    def budgetOptions(self):
+        """ The budget, part of the extraction cache key """
+        if not self.hasBudget():
+            return ''
+        return 'tokens={},characters={}'.format(self.max_tokens, self._characterLimit())
+
+    def spend(self, cleaned):
+        """ Counts the cleaned text of a page against the budget, returns True once the budget is used up """
+        if not self.hasBudget():
+            return False
+        self._tokens += cleaned.count(' ') + 1 if cleaned else 0
+        self._characters += len(cleaned)
+        limit = self._characterLimit()
+        return ((self.max_tokens is not None and self._tokens >= self.max_tokens) or
+                (limit is not None and self._characters >= limit))
+
+    def trim(self, text):
+        """ Cuts a cleaned text down to the budget, at a word boundary """
+        if self.max_tokens is not None:
+            words = text.split(' ', self.max_tokens)
+            if len(words) > self.max_tokens:
+                text = ' '.join(words[:self.max_tokens])
+        limit = self._characterLimit()
+        if limit is not None and len(text) > limit:
+            # the last space at or before limit, a text without one is cut at limit
+            cut = text.rfind(' ', 0, limit + 1)
+            text = text[:cut] if cut > 0 else text[:limit]
+        return text
+
+    def clean_page(self, text):
+        """ The cleaned (and normalised) text of one page
+
+            cleaning and normalising never join words across a line break, so doing it page by page
+            gives the same text as doing it on the whole book, without the whole raw book, its
+            normalised copy and its cleaned copy all being in memory at the same time
+        """
+        if self.normalise:
+            text = self.normalize_document(text)
+        return self.remove_characters_before_tokenization(text)
+
+    def ocrOptions(self):
+        """ The OCR settings that change the text, part of the extraction cache key """
+        if self.adaptive_dpi:
+            return 'dpi={},adaptive={},{}'.format(self.dpi, self.low_dpi, self.min_word_ratio)
+        return 'dpi={}'.format(self.dpi)
+
+    def ocr_page(self, file_path, page_num):
+        """ Renders, preprocesses and OCRs a single page, returns its cleaned text
+
+            every call opens the document itself, a pymupdf document can't be shared between threads
+        """
+        with pymupdf.open(file_path) as doc:
+            if self.adaptive_dpi and self.low_dpi < self.dpi:
+                # about a quarter of the pixels at 150 instead of 300 dpi,
+                # most printed text reads just as well
+                img_array = self.advanced_image_preprocessing(self.render_page(doc[page_num], self.low_dpi))
+                text = self.remove_characters_before_tokenization(self.ocr_image(img_array))
+                if wordRatio(text) >= self.min_word_ratio:
+                    self.page_dpi[page_num] = self.low_dpi
+                    if self.save_images:
+                        self.save_page_image(file_path, page_num, img_array)
+                    return text
+            img_array = self.advanced_image_preprocessing(self.render_page(doc[page_num]))
+        if self.save_images:
+            self.save_page_image(file_path, page_num, img_array)
+        text = self.remove_characters_before_tokenization(self.ocr_image(img_array))
+        self.page_dpi[page_num] = self.dpi
+        return text
+
+    def ocr_pages(self, file_path, page_numbers):
+        """ OCRs the given pages on the process wide OCR threads, returns {page number: cleaned text},
+            a page that failed is left out
+        """
+        page_numbers = list(page_numbers)
+        scheduler = getScheduler()
+        # with a budget the pages go in batches of one per OCR thread,
+        # the rest of the book isn't OCR-ed once there's enough text
+        batch_size = scheduler.max_workers if self.hasBudget() else max(len(page_numbers), 1)
+        texts = {}
+        self.page_dpi = {}
+        read = 0
+        while read < len(page_numbers):
+            batch = page_numbers[read:read + batch_size]
+            read += len(batch)
+            # the pages are shared fairly with the other documents being OCR-ed
+            results = scheduler.submit(self.ocr_page, [(file_path, page_num) for page_num in batch]).result()
+            texts.update((page_num, text) for page_num, text in zip(batch, results) if text is not None)
+            if any([self.spend(text) for text in results if text is not None]):
+                break
+        self.stats['skipped_pages'] = self.stats.get('skipped_pages', 0) + len(page_numbers) - read
+
+        # page number -> dpi the page was OCR-ed at (the keys are strings once it's been through the cache)
+        self.stats['ocr_dpi'] = dict(sorted(self.page_dpi.items()))
+        if self.adaptive_dpi:
+            self.stats['ocr_escalated'] = sum(dpi == self.dpi for dpi in self.page_dpi.values())
+        logger.info(f"OCR-ed {len(texts)} pages in memory")
+        return texts
+
+    def ocr_document(self, file_path):
+        """ Reads a scanned document: every page is rendered, preprocessed and OCR-ed in memory,
+            nothing is written to disk and no other program is started
+        """
+        with pymupdf.open(file_path) as doc:
+            pages = min(self.pages or len(doc), len(doc))
+
+        texts = self.ocr_pages(file_path, range(pages))
+        TEXT = ' '.join(texts[page_num] for page_num in sorted(texts))
+
+        return self.normalize_document(TEXT) if self.normalise else TEXT
+
     def convert_pdf_to_images(self, file_path, save_images=False, *, prefix='page', fmt='PNG'):
         """ converts a single book into a series of single PDFs as per page, saves it in the respective folder
             then processes those pages
+
+            the old disk based OCR path (poppler + a pdf per page), replaced by ocr_document
+            and only kept for comparing the two in time_ocr()
         """
-        destn = '/home/ngoni97/file-manger-with-ml/Test_Data'
-        # initialise directories
-        if not os.path.exists(destn):
-            os.makedirs(destn, exist_ok=True)
+        from pdf2image import convert_from_path
 
-        enhanced_images = os.path.join(destn, 'Enhanced_Images')
-        if not os.path.exists(enhanced_images):
-            os.makedirs(enhanced_images)
+        # initialise directories
+        enhanced_images = self.images_folder
+        os.makedirs(enhanced_images, exist_ok=True)
 
         # original images
         images = convert_from_path(file_path, last_page=self.pages, dpi=self.dpi, fmt=fmt)
@@ -176,27 +341,13 @@ class PdfDataCollector():
     
     def Multithreading(self, PATH):
         """ takes in a folder of files and uses multithreading to speed up the processing """
-        threads = []
         FOLDER = os.listdir(PATH)
 
-        # create threads
-        for file in FOLDER:
-            path = os.path.join(PATH, file)
-            thread = Thread(target=self.Read_ocr, args=(path,))
-            threads.append(thread)
-
-        with self.lock:
-            for thread in threads:
-                thread.start()
-                time.sleep(1)
-            # join threads
-            for thread in threads:
-                thread.join()
-                time.sleep(0.5)
+        # one task per page pdf on the process wide OCR threads, result() waits for all of them
+        getScheduler().submit(self.Read_ocr, [(os.path.join(PATH, file),) for file in FOLDER]).result()
         
-        Text = ""
-        for page in sorted(self.book_dict):
-            Text += self.book_dict[page]
+        # joined once, += copied the whole text again for every page
+        Text = ' '.join(self.book_dict[page] for page in sorted(self.book_dict))
 
         # delete the folder when done
         if not self.save_images:
@@ -206,16 +357,71 @@ class PdfDataCollector():
 
         return Text
 
-    def is_text_extractable(self, page):
+    def toc_document(self, filename):
+        """ The text of a bookmarked document without reading the whole of it:
+            the title, subject and keywords, every outline title and the text layer of the
+            front matter pages the outline points to (no OCR), None when there's no outline
+        """
+        with pymupdf.open(filename) as doc:
+            toc = doc.get_toc()
+            if not toc:
+                return None
+            pages = min(self.pages or len(doc), len(doc))
+            metadata = doc.metadata or {}
+            parts = [metadata.get(key) or '' for key in ('title', 'subject', 'keywords')]
+            parts.extend(title for _, title, _ in toc)
+
+            # a front matter section ends where the next outline entry starts,
+            # no more than pages are read from the whole document
+            starts = sorted({page - 1 for _, _, page in toc if page > 0})
+            read = set()
+            for _, title, page in toc:
+                if page < 1 or page > len(doc) or not FRONT_MATTER.search(title):
+                    continue
+                start = page - 1
+                following = starts[bisect_right(starts, start):]
+                end = min(following[0] if following else len(doc), start + min(FRONT_MATTER_PAGES, pages))
+                spent = False
+                for page_num in range(start, end):
+                    if page_num in read:
+                        continue
+                    if len(read) == pages:
+                        spent = True
+                        break
+                    read.add(page_num)
+                    text = doc[page_num].get_text()
+                    parts.append(text)
+                    if self.spend(self.remove_characters_before_tokenization(text)):
+                        spent = True
+                        break
+                if spent:
+                    break
+
+        logger.info(f"Read {os.path.basename(filename)} from its outline: {len(toc)} entries, "
+                    f"{len(read)} front matter pages")
+        self.stats = {'pages': pages, 'toc_entries': len(toc), 'front_matter_pages': len(read),
+                      'skipped_pages': max(pages - len(read), 0)}
+        return '\n'.join(parts)
+
+    def is_text_extractable(self, page, text=None):
         """
         Test if a page has extractable text without triggering OCR initialization
+
+        text: the page's plain text if it has already been extracted (see get_document)
         """
         try:
             # Get text using standard method first
-            text = page.get_text()
+            if text is None:
+                text = page.get_text()
             if text and len(text.strip()) > 50:  # Arbitrary threshold for meaningful text
                 return True
-            
+
+            # no fonts, no text: a scanned page, no need for the dict extraction
+            if not page.get_fonts():
+                return False
+            if text and text.strip():
+                return True
+
             # Check for text blocks/fonts as an indicator of digital text
             text_dict = page.get_text("dict")
             if text_dict and "blocks" in text_dict:
@@ -252,140 +458,220 @@ class PdfDataCollector():
 
     def get_document(self, filename):
         """ Returns a text file of the selected document"""
-        self.Text = ""
+        # cleaned text of every page in page order, joined once at the end
+        pieces = []
+        # page counts of the document, reported by pdf_extraction_engine
+        self.stats = {}
         
         # Validate file before processing
-        if not os.path.exists(filename):
-            return ""
-        
-        # Setup directory structure
         try:
-            # fix this part since it specific to my files tree in my own PC
-            self.main_folder_path = os.path.basename(os.path.dirname(os.path.dirname(filename)))
-            self.parent_directory = os.path.join(
-                '/home/ngoni97/file-manger-with-ml/Test_Data/Saved_Text_Files', 
-                self.main_folder_path
-            )
-            
-            if not os.path.exists(self.parent_directory):
-                os.makedirs(self.parent_directory, exist_ok=True)
-        except Exception:
-            pass
-        
-        # Create text file path
-        base_name = os.path.splitext(os.path.basename(filename))[0]
-        text_file_path = os.path.join(self.parent_directory, f"{base_name}.txt")
+            # taken before reading, the cache entry belongs to this version of the file
+            file_stat = os.stat(filename)
+        except OSError:
+            return ""
+        options = extractionOptions(self.pages, self.normalise, self.ocrOptions(), self.budgetOptions(),
+                                    'toc' if self.toc_first else 'pages')
+        if self.cache is not None:
+            cached = self.cache.get(filename, file_stat, options)
+            if cached is not None:
+                result, self.stats = cached
+                self.stats['cached'] = True
+                if self.save_as_text_file and result:
+                    self.save_text_file(filename, result)
+                return result
 
-        digital_pages = 0
-        ocr_pages = 0
-        doc = None
+        # pages left unread because the budget was used up
+        skipped = 0
+        # bookmarked documents are read from their outline, None when there isn't one
+        toc_text = None
+        if self.toc_first:
+            try:
+                toc_text = self.toc_document(filename)
+            except Exception as e:
+                logger.error(f"Error reading the outline of {filename}: {e}")
+        if toc_text is not None:
+            pieces = [self.clean_page(toc_text)]
+        else:
+            doc = None
 
-        try:
-            # Open document with explicit error handling
-            doc = pymupdf.open(filename)
-            if doc is None:
-                return ""
-            
-            doc_length = len(doc)
-            if doc_length == 0:
-                return ""
-            
-            pages_to_process = min(self.pages or doc_length, doc_length)
-            
-            # Test first few pages to determine document type
-            test_pages = min(5, doc_length)
-            
-            for page_num in range(test_pages):
-                try:
-                    page = doc[page_num]
-                    if page is None:
-                        continue
-                    
-                    # Test for digital text first (safer approach)
-                    if self.is_text_extractable(page):
-                        digital_pages += 1
-                    elif self.has_images_or_drawings(page):
-                        # Only count as OCR if there are images/drawings but no extractable text
-                        ocr_pages += 1
-                            
-                except Exception as e:
-                    logger.error(f"Error testing page {page_num}: {e}")
-                    continue
-            
-            logger.info(f"Document analysis: {digital_pages} digital pages, {ocr_pages} OCR pages")
-            
-            # Process based on document type
-            if digital_pages > 0:
-                # Digital PDF processing (safer)
-                logger.info(f"Processing digitally-born pdf: {os.path.basename(filename)}")
-                for page_num in range(pages_to_process):
-                    try:
-                        page = doc[page_num]
-                        if page is None:
-                            continue
-                        text = page.get_text()
-                        if text:
-                            self.Text += text
-                    except Exception as e:
-                        logger.error(f"Error extracting text from page {page_num}: {e}")
-                        continue
+            try:
+                # Open document with explicit error handling
+                doc = pymupdf.open(filename)
+                if doc is None:
+                    return ""
             
-            elif ocr_pages > 0:
-                # OCR processing with reduced concurrency
-                logger.info(f"Processing OCR scanned pdf: {os.path.basename(filename)}")
-                doc.close()  # Close before OCR to prevent conflicts
-                doc = None
-                self.Text = self.convert_pdf_to_images(filename)
+                doc_length = len(doc)
+                if doc_length == 0:
+                    return ""
             
-            else:
-                # Fallback: try to extract any available text
-                logger.warning(f"No clear document type detected for {filename}, attempting text extraction")
+                pages_to_process = min(self.pages or doc_length, doc_length)
+                # page number -> cleaned text, the text layer and the OCR results merged in page order
+                texts = {}
+                # image-only pages, the only ones that are OCR-ed
+                ocr_queue = []
+                empty_pages = 0
+
+                # every page is routed on its own, a scanned book with some digital pages
+                # (or the other way round) only OCRs the pages without a text layer
                 for page_num in range(pages_to_process):
                     try:
                         page = doc[page_num]
                         if page is None:
                             continue
                         text = page.get_text()
-                        if text and text.strip():
-                            self.Text += text
+
+                        if self.is_text_extractable(page, text):
+                            # cleaned straight away, the raw text of the page isn't kept
+                            texts[page_num] = self.clean_page(text)
+                            if self.spend(texts[page_num]):
+                                # the queued scanned pages aren't OCR-ed either
+                                skipped = pages_to_process - page_num - 1 + len(ocr_queue)
+                                ocr_queue = []
+                                break
+                        elif self.has_images_or_drawings(page):
+                            ocr_queue.append(page_num)
+                        else:
+                            empty_pages += 1
                     except Exception as e:
-                        logger.error(f"Error in fallback text extraction from page {page_num}: {e}")
+                        logger.error(f"Error reading page {page_num}: {e}")
                         continue
-                
-                # If still no text, try OCR as last resort
-                if not self.Text.strip():
+
+                if not texts and not ocr_queue:
+                    # If still no text, try OCR as last resort
                     logger.info("No text found, falling back to OCR processing")
-                    if doc:
-                        doc.close()
-                        doc = None
-                    self.Text = self.convert_pdf_to_images(filename)
+                    ocr_queue = list(range(pages_to_process))
+                    empty_pages = 0
+
+                # after the fallback, so the counts are the routing that actually runs
+                logger.info(f"Document analysis: {len(texts)} digital pages, {len(ocr_queue)} OCR pages, "
+                            f"{empty_pages} empty pages")
+                self.stats = {'pages': pages_to_process, 'digital_pages': len(texts), 'ocr_pages': len(ocr_queue),
+                              'empty_pages': empty_pages}
+
+                if ocr_queue:
+                    doc.close()  # Close before OCR to prevent conflicts
+                    doc = None
+                    ocr_texts = self.ocr_pages(filename, ocr_queue)
+                    # the OCR text is already cleaned, only normalise it
+                    texts.update((page_num, self.clean_page(text) if self.normalise else text)
+                                 for page_num, text in ocr_texts.items())
+
+                pieces = [texts.pop(page_num) for page_num in sorted(texts)]
             
-        except Exception as e:
-            logger.error(f"Error opening file {filename}: {e}")
-            return ""
-        finally:
-            # Always close the document
-            if doc:
-                try:
-                    doc.close()
-                except Exception as e:
-                    logger.error(f"Error closing document: {e}")
-
-        if self.save_as_text_file and self.Text:
-            try:
-                with open(text_file_path, 'w', encoding='utf-8') as text_file:
-                    if self.normalise:
-                        text_file.write(self.remove_characters_before_tokenization(self.normalize_document(self.Text)))
-                    else:
-                        text_file.write(self.remove_characters_before_tokenization(self.Text))
             except Exception as e:
-                logger.error(f"Error saving text file: {e}")
+                logger.error(f"Error opening file {filename}: {e}")
+                return ""
+            finally:
+                # Always close the document
+                if doc:
+                    try:
+                        doc.close()
+                    except Exception as e:
+                        logger.error(f"Error closing document: {e}")
 
-        result = (self.remove_characters_before_tokenization(self.normalize_document(self.Text))
-                   if self.normalise else self.remove_characters_before_tokenization(self.Text))
+        self.stats['skipped_pages'] = self.stats.get('skipped_pages', 0) + skipped
+        # one join instead of adding up the text page by page, which copied it all again for every page
+        result = ' '.join([piece for piece in pieces if piece])
+        if self.hasBudget():
+            result = self.trim(result)
+        if self.max_memory is not None and self._characters >= self.max_memory:
+            logger.warning(f"{os.path.basename(filename)} stopped at the memory ceiling of {self.max_memory} bytes")
+            self.stats['memory_limited'] = True
+
+        if self.save_as_text_file and pieces:
+            self.save_text_file(filename, result)
+        if self.cache is not None:
+            self.cache.put(filename, file_stat, options, result, self.stats)
 
         return result
+
+    def save_text_file(self, filename, text):
+        """ Saves the cleaned text of a document as a text file, or in self.store under its path """
+        try:
+            # Setup directory structure
+            # fix this part since it specific to my files tree in my own PC
+            self.main_folder_path = os.path.basename(os.path.dirname(os.path.dirname(filename)))
+            if self.store is not None:
+                # the folder name is the category RUNMODEL trains on
+                self.store.put(filename, text, self.main_folder_path)
+                return
+            self.parent_directory = os.path.join(
+                '/home/ngoni97/file-manger-with-ml/Test_Data/Saved_Text_Files', 
+                self.main_folder_path
+            )
+            
+            if not os.path.exists(self.parent_directory):
+                os.makedirs(self.parent_directory, exist_ok=True)
+
+            # Create text file path
+            base_name = os.path.splitext(os.path.basename(filename))[0]
+            text_file_path = os.path.join(self.parent_directory, f"{base_name}.txt")
+            with open(text_file_path, 'w', encoding='utf-8') as text_file:
+                text_file.write(text)
+        except Exception as e:
+            logger.error(f"Error saving text file: {e}")
     
+def time_ocr(file_path, *, pages=3, dpi=300):
+    """ timing the OCR latency per page: the old disk based path against the in-memory one """
+    collector = PdfDataCollector(file_path, pages, dpi=dpi)
+    with pymupdf.open(file_path) as doc:
+        pages = min(pages, len(doc))
+
+    for name, method in (('disk (pdf2image + pdf per page)', collector.convert_pdf_to_images),
+                         ('in-memory (get_pixmap + numpy)', collector.ocr_document)):
+        collector.book_dict = {}
+        start = time.perf_counter()
+        method(file_path)
+        elapsed = time.perf_counter() - start
+        print('{:<32} {:>8.1f} ms per page'.format(name, elapsed / pages * 1000))
+
+def _oldExtraction(file_path, normalise):
+    """ The old text accumulation, kept for time_memory(): the raw text added up page by page,
+        then normalised and cleaned as a whole
+    """
+    Text = ""
+    with pymupdf.open(file_path) as doc:
+        for page in doc:
+            Text += page.get_text()
+    return cleanText(normaliseDocument(Text)) if normalise else cleanText(Text)
+
+def time_memory(*, pages=1000, normalise=True, max_memory=1024 ** 2):
+    """ timing and tracemalloc peak of a large book: the old accumulation,
+        the page by page cleaning and the same with a memory ceiling
+    """
+    import shutil
+    import tempfile
+    import tracemalloc
+
+    folder = tempfile.mkdtemp(prefix='pdf_memory_')
+    try:
+        doc = pymupdf.open()
+        paragraph = ("The quick brown fox jumps over the lazy dog whilst the integral of x squared "
+                     "from zero to one equals one third. ") * 24
+        for _ in range(pages):
+            doc.new_page().insert_textbox(pymupdf.Rect(40, 40, 560, 810), paragraph, fontsize=8)
+        file_path = os.path.join(folder, 'book.pdf')
+        doc.save(file_path)
+        doc.close()
+
+        runs = (('old (+= then clean)', lambda: _oldExtraction(file_path, normalise)),
+                ('page by page', lambda: PdfDataCollector(file_path, normalise=normalise).text),
+                ('max_memory={}'.format(max_memory),
+                 lambda: PdfDataCollector(file_path, normalise=normalise, max_memory=max_memory).text))
+        texts = []
+        for name, function in runs:
+            tracemalloc.start()
+            start = time.perf_counter()
+            texts.append(function())
+            elapsed = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print('{:<24} {:>8.3f} s  peak {:>7.1f} MB  text {:>7.1f} MB'.format(
+                name, elapsed, peak / 1024 ** 2, len(texts[-1]) / 1024 ** 2))
+        assert texts[0] == texts[1]
+    finally:
+        shutil.rmtree(folder)
+
 if __name__ == "__main__":
 
     FILE_PATH = '/home/ngoni97/Documents/MATHEMATICS/Principia Mathematica/Principia_Mathematica [volume.I] alfred_north_whitehead x betrand_russell.pdf'
@@ -8,38 +8,135 @@ Created on Sun Jan 26 03:13:36 2025
 # どうもありがとうございます == Dōmo arigatōgozaimasu
 
 import os
+import time
 import timeit
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 
+def scanFolders(parent_path):
+    """ Walks a directory tree with os.scandir and yields (dir_path, files)
+
+        dir_path is only yielded when it contains at least one file,
+        files is the list of file names (not full paths) inside it.
+        The DirEntry type info is reused so no extra stat calls are made
+        for plain files and directories
+
+        the folders come out depth first and sorted by name, the same order as
+        parallelScanFolders, so FolderIterator keeps the same first folder of a
+        given name whichever walker is used
+    """
+    # explicit stack instead of recursion, deep trees can't hit the recursion limit
+    stack = [parent_path]
+    while stack:
+        dir_path = stack.pop()
+        files, sub_folders = _scanFolder(dir_path)
+        if files:
+            yield dir_path, files
+        # reversed so that the sub folders are visited in sorted order
+        stack.extend(reversed(sub_folders))
+
+def _scanFolder(dir_path):
+    """ Lists a single folder, returns (files, sub_folders) sorted by name """
+    files = []
+    sub_folders = []
+    try:
+        with os.scandir(dir_path) as entries:
+            for entry in entries:
+                # don't follow symlinked folders, shortcuts can point outside
+                # the initial directory or back into it
+                if entry.is_dir(follow_symlinks=False):
+                    sub_folders.append(entry.path)
+                elif entry.is_file():
+                    files.append(entry.name)
+    except OSError:
+        # unreadable folders (permissions, removed whilst walking) are skipped
+        pass
+    files.sort()
+    sub_folders.sort()
+    return files, sub_folders
+
+def parallelScanFolders(parent_path, *, max_workers=8, scan=_scanFolder):
+    """ The same (dir_path, files) as scanFolders but the folders are listed
+        by a pool of max_workers threads, for slow disks and network mounts
+        where every listdir waits on the device
+
+        the results come out in a deterministic order (depth first, sorted by name)
+        no matter which thread finishes first
+    """
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    def submit(path):
+        return executor.submit(task, path)
+
+    def task(path):
+        # the sub folders are queued as soon as their parent is listed,
+        # so the pool fans out over the whole tree without waiting for the consumer
+        files, sub_folders = scan(path)
+        return files, [(sub_folder, submit(sub_folder)) for sub_folder in sub_folders]
+
+    try:
+        stack = [(parent_path, submit(parent_path))]
+        while stack:
+            dir_path, future = stack.pop()
+            files, sub_folders = future.result()
+            if files:
+                yield dir_path, files
+            stack.extend(reversed(sub_folders))
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
 class FolderIterator():
-    def __init__(self, directory, *, folder_name=True):
+    def __init__(self, directory, *, folder_name=True, lazy=False, index=None, workers=None):
         self._directory = directory
         self._folder_name = folder_name
+        # workers=N lists the folders with a pool of N threads (see parallelScanFolders)
+        self._workers = workers
+        # optional directory_index.DirectoryIndex, unchanged folders are then read
+        # from the index instead of being listed again
+        self._index = index
     
         # initialise with an empty list when creating a new class instance
         self.categories = []
         self.directory_path_names = []
+        # sets for the duplicates check, the lists above keep the order
+        self._seen_categories = set()
         
-        self.ListFolders(self._directory, self.categories, self.directory_path_names)
+        # lazy=True leaves the walk to iterFolders() so the caller can start
+        # working on the first folders before the whole tree has been read
+        if not lazy:
+            self.ListFolders(self._directory, self.categories, self.directory_path_names)
         
-    def ListFolders(self, parent_path, categories=[], directory_path_names=[]):
+    def iterFolders(self, parent_path=None):
+        """ Generator mode: yields (dir_path, files) as the tree is walked
+            and records the categories along the way
+
+            only the first folder with a given name is yielded,
+            the same as the categories returned by ListFolders
+        """
+        parent_path = parent_path or self._directory
+        if self._index is not None:
+            folders = self._index.update(parent_path).iterFolders(parent_path)
+        elif self._workers:
+            folders = parallelScanFolders(parent_path, max_workers=self._workers)
+        else:
+            folders = scanFolders(parent_path)
+        for dir_path, files in folders:
+            Folder = os.path.basename(dir_path)
+            if Folder in self._seen_categories:
+                continue
+            self._seen_categories.add(Folder)
+            self.categories.append(Folder)
+            self.directory_path_names.append(dir_path)
+            yield dir_path, files
+
+    def ListFolders(self, parent_path=None, categories=None, directory_path_names=None):
         ''' Iterates through directories and returns folder names '''
-        
-        for folder in os.listdir(parent_path):
-            # if it contains only files then append the folder name
-            Path = os.path.join(parent_path, folder)
-            if os.path.isdir(Path):
-                    self.ListFolders(Path, self.categories, self.directory_path_names)
-            else:
-                 # base case
-                 if os.path.isfile(Path):
-                     Folder = os.path.basename(os.path.dirname(Path))
-                     if Folder in self.categories:
-                         pass
-                     else:
-                         self.categories.append(Folder)
-                         self.directory_path_names.append(os.path.dirname(Path))
-        
+        # categories and directory_path_names are kept for the old call signature,
+        # the results always go into self.categories and self.directory_path_names
+        for _ in self.iterFolders(parent_path):
+            pass
               
         return self.categories, self.directory_path_names
     
@@ -69,6 +166,56 @@ FolderIterator(path)
                   stmt=TEST_CODE,
                   number=100)))
     
+def makeDeepTree(root, *, depth=4, branching=4, files_per_folder=5):
+    """ Creates a synthetic folder tree for timing, returns the number of folders """
+    folders = 1
+    for i in range(files_per_folder):
+        open(os.path.join(root, 'file_{}.pdf'.format(i)), 'w').close()
+    if depth > 0:
+        for i in range(branching):
+            sub_folder = os.path.join(root, 'folder_{}'.format(i))
+            os.mkdir(sub_folder)
+            folders += makeDeepTree(sub_folder, depth=depth - 1, branching=branching,
+                                    files_per_folder=files_per_folder)
+    return folders
+
+def time_walkers(*, depth=4, branching=4, latency=0.002, workers=(2, 4, 8, 16)):
+    """ timing the serial walk against the parallel one on a synthetic deep tree
+
+        latency adds a sleep to every folder listing to stand in for a slow
+        USB/network mount, 0 times the local disk as it is
+    """
+    root = tempfile.mkdtemp(prefix='folder_iterator_')
+    try:
+        folders = makeDeepTree(root, depth=depth, branching=branching)
+
+        def slowScan(dir_path):
+            time.sleep(latency)
+            return _scanFolder(dir_path)
+
+        def serialWalk():
+            # the serial walk, one listing at a time
+            stack = [root]
+            while stack:
+                files, sub_folders = slowScan(stack.pop())
+                stack.extend(sub_folders)
+
+        start = time.perf_counter()
+        serialWalk()
+        serial = time.perf_counter() - start
+        print('{} folders, {:.1f} ms latency per listing'.format(folders, latency * 1000))
+        print('serial:               {:.3f} s'.format(serial))
+
+        expected = sorted((dir_path, sorted(files)) for dir_path, files in scanFolders(root))
+        for max_workers in workers:
+            start = time.perf_counter()
+            results = list(parallelScanFolders(root, max_workers=max_workers, scan=slowScan))
+            elapsed = time.perf_counter() - start
+            assert sorted(results) == expected
+            print('parallel {:>2} workers:  {:.3f} s  ({:.1f}x)'.format(max_workers, elapsed, serial / elapsed))
+    finally:
+        shutil.rmtree(root)
+
 if __name__ == "__main__":
     
     Test = FolderIterator('/home/ngoni97/Documents/MATHEMATICS', folder_name=False)
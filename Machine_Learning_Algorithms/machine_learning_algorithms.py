@@ -8,13 +8,11 @@ Created on Sun Jan 19 04:45:47 2025
 # どうもありがとうございます == Dōmo arigatōgozaimasu
 
 import os
-import re
 import numpy as np
 import pickle
 import time
 
 # loading machine learning modules
-import nltk
 from sklearn.model_selection import train_test_split
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.feature_extraction.text import CountVectorizer
@@ -26,6 +24,8 @@ from sklearn.svm import LinearSVC
 
 from folder_iterator_class import FolderIterator
 from updated_reading_pdf_contents_data_saver_with_concurrent import DocumentContentDataset
+from corpus_store import CorpusStore
+from text_normalisation import cleanText, normaliseDocument, normaliseDocuments
 
 """ model_types:
     MultinomialNB
@@ -34,29 +34,50 @@ from updated_reading_pdf_contents_data_saver_with_concurrent import DocumentCont
 """
 
 class LOAD_DATASET():
-    def __init__(self, folders=[], *, pages=10, normalise=False, save_as_text_file=True):
+    def __init__(self, folders=[], *, pages=10, normalise=False, save_as_text_file=True, index=None,
+                 cache='extraction_cache.sqlite', max_tokens=None,
+                 toc_first=False, store=None):
 
-        """ folders list must contain full folder paths """
+        """ folders list must contain full folder paths
+            index: optional directory_index.DirectoryIndex shared by all the folders
+            cache: extraction_cache database, unchanged pdf files aren't read again (None turns it off)
+            max_tokens: words of text kept per document, the rest of the pages aren't read
+            toc_first: bookmarked documents are read from their outline and front matter only
+            store: corpus_store directory the texts are saved to instead of one .txt file per book
+        """
         self.folders = folders
         self.pages = pages
         self.normalise = normalise
         self.save_as_text_file = save_as_text_file
+        self.index = index
+        self.cache = cache
+        self.max_tokens = max_tokens
+        self.toc_first = toc_first
+        self.store = store
 
         for folder in self.folders:
 
             load_folder = DocumentContentDataset(folder, pages=self.pages, 
                                                  normalise=self.normalise, 
-                                                 save_as_text_file=self.save_as_text_file)
+                                                 save_as_text_file=self.save_as_text_file,
+                                                 index=self.index,
+                                                 cache=self.cache,
+                                                 max_tokens=self.max_tokens,
+                                                 toc_first=self.toc_first,
+                                                 store=self.store)
             pass
 
 class RUNMODEL():
     def __init__(self, folder_path,*, model_type=None,
                   use_saved_model=False, vectoriser='CountVectorizer',
-                  test_size=0.3, random_state=42):
+                  test_size=0.3, random_state=42, index=None, store=None):
         """ model_type:
             - MultinomialNB
             - ComplementNB
             - LinearSVC
+
+            store: corpus_store directory written by LOAD_DATASET, read instead of
+            the .txt files under folder_path when given
         """
         self._folder_path = folder_path
         self.use_saved_model = use_saved_model
@@ -65,22 +86,15 @@ class RUNMODEL():
         self._model_type = model_type
         self.test_size = test_size
         self.random_state = random_state
+        self.index = index
+        self.store = store
         
         # run main
         self.main()
         
     def remove_characters_before_tokenization(self, sentence, keep_apostrophes=False):
         """ remove characters and keeps words only"""
-        if not sentence:
-            return ""
-        # string
-        sentence = (sentence.replace('_', ' ')).replace('-', ' ')
-        PATTERN = re.compile('[?|$|&|*|%|@|(|)|~]')
-        pattern = re.compile('[^a-zA-Z]') if not keep_apostrophes else re.compile('[^a-zA-Z\']')
-        replacement = r' '
-        
-        filtered_sentence = re.sub(pattern, replacement, re.sub(PATTERN, replacement, sentence))
-        return ' '.join(filtered_sentence.lower().split())  # Remove extra spaces
+        return cleanText(sentence, keep_apostrophes)
     
     def dataCollector(self, path, clean=False):
         import os
@@ -103,18 +117,25 @@ class RUNMODEL():
                         Data[item] = text
         return Data
     
+    def storeCollector(self, clean=False):
+        """ Returns the texts and their categories (labels) from the corpus store,
+            streamed shard by shard instead of opening a file per book
+        """
+        Data = []
+        labels = []
+        with CorpusStore(self.store) as store:
+            for _, category, text in store.iterDocuments():
+                if clean:
+                    text = self.remove_characters_before_tokenization(text)
+                    if not text:
+                        continue
+                Data.append(text)
+                labels.append(category)
+        return Data, labels
+    
     def normalize_document(self, doc):
-        # lower case and remove special characters\whitespaces
-        doc = re.sub(r'[^a-zA-Z0-9\s]', '', doc, re.I)
-        doc = doc.lower()
-        doc = doc.strip()
-        # tokenize document
-        tokens = self.wpt.tokenize(doc)
-        # filter stopwords out of document
-        filtered_tokens = [token for token in tokens if token not in self.stop_words]
-        # re-create document from filtered tokens
-        doc = ' '.join(filtered_tokens)
-        return doc
+        """ tokenize and remove stopwords """
+        return normaliseDocument(doc)
     
     def labelEncoder(self, labels):
         self.enc = LabelEncoder()
@@ -135,9 +156,8 @@ class RUNMODEL():
     def return_X_y(self, data_list_obj, labels_list_obj):
         """ returns the normalised X and encoded y datasets """
 
-        self.normalize_corpus = np.vectorize(self.normalize_document)
-
-        self.X = self.normalize_corpus(data_list_obj)
+        # the stopwords are looked up once for the whole corpus
+        self.X = np.array(normaliseDocuments(data_list_obj))
         self.y = self.labelEncoder(labels_list_obj)
         return self.X, self.y
 
@@ -198,29 +218,25 @@ class RUNMODEL():
         return self._MODEL
     
     def main(self):
-        
-        roman_numerals = ['i', 'ii', 'iii', 'iv', 'v', 'vi', 'vii', 'viii', 'ix', 'x',
-                   'xi', 'xii', 'xiii', 'xiv', 'xv', 'xvi', 'xvii', 'xviii', 'xix', 'xx']
-        cardinals = ['nd', 'rd', 'th']
-        self.stop_words = nltk.corpus.stopwords.words('english')
-        self.stop_words = self.stop_words + list('qwertyuiopasdfghjklzxcvbnm') + roman_numerals + cardinals
-        self.wpt = nltk.WordPunctTokenizer()
 
-        folders = FolderIterator(self._folder_path, folder_name=False)
+        if self.store is not None:
+            Data, labels = self.storeCollector(True)
+        else:
+            folders = FolderIterator(self._folder_path, folder_name=False, index=self.index)
 
-        # collecting the data
-        data_list = []
-        # creating labels
-        labels = []
-        for folder in folders.returnCategories():
-            data = self.dataCollector(folder, True)
-            data_list.append(data)
+            # collecting the data
+            data_list = []
+            # creating labels
+            labels = []
+            for folder in folders.returnCategories():
+                data = self.dataCollector(folder, True)
+                data_list.append(data)
 
-            labels.extend([os.path.basename(folder)]*len(data))
+                labels.extend([os.path.basename(folder)]*len(data))
 
-        Data = []
-        for data in data_list:
-            Data.extend(list(data.values()))
+            Data = []
+            for data in data_list:
+                Data.extend(list(data.values()))
         
         # normalising the data and encoding the labels
         normalised_data, enc_labels = self.return_X_y(Data, labels)
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 13:08:36 2026
+
+@author: ngoni97
+"""
+# どうもありがとうございます == Dōmo arigatōgozaimasu
+
+# one pool of OCR threads for the whole process instead of a thread per page per document,
+# the pages of all the documents wait in one queue and the workers take them
+# round robin, one page of each document in turn, so a big book doesn't hold up
+# the small ones and two books don't start twice as many threads as there are cores
+
+import os
+import logging
+from collections import deque
+from concurrent.futures import Future
+from threading import Thread, Condition, Lock
+
+logger = logging.getLogger(__name__)
+
+class _Document():
+    """ The pages of one submitted document and the future they are assembled into """
+    __slots__ = 'future', 'function', 'pending', 'results', 'remaining', 'lock'
+
+    def __init__(self, function, tasks):
+        self.future = Future()
+        self.function = function
+        # (page index, args) still waiting for a worker
+        self.pending = deque(enumerate(tasks))
+        self.results = [None] * len(tasks)
+        self.remaining = len(tasks)
+        self.lock = Lock()
+
+    def done(self, index, result):
+        """ Stores the result of a page, the future is resolved with the last one """
+        with self.lock:
+            self.results[index] = result
+            self.remaining -= 1
+            finished = self.remaining == 0
+        if finished:
+            self.future.set_result(self.results)
+
+
+class OcrScheduler():
+    """
+    A fixed number of worker threads and a round robin queue of (document, page) tasks
+
+    submit() returns one future per document, resolved with the results of its pages
+    in page order, a page that fails is logged and gives None
+    """
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._condition = Condition()
+        # documents with pages waiting, the one at the front gives the next page
+        self._documents = deque()
+        self._threads = []
+        self._shutdown = False
+
+    def submit(self, function, tasks):
+        """ Queues function(*args) for every args in tasks (one per page),
+            returns a future of the list of results
+        """
+        tasks = list(tasks)
+        document = _Document(function, tasks)
+        if not tasks:
+            document.future.set_result([])
+            return document.future
+
+        with self._condition:
+            if self._shutdown:
+                raise RuntimeError('cannot submit after shutdown')
+            self._documents.append(document)
+            # the workers are started on the first submit
+            while len(self._threads) < self.max_workers:
+                thread = Thread(target=self._worker, name='OcrScheduler-{}'.format(len(self._threads)),
+                                daemon=True)
+                thread.start()
+                self._threads.append(thread)
+            self._condition.notify(len(tasks))
+        return document.future
+
+    def shutdown(self, wait=True):
+        """ Lets the workers finish the queued pages, then stops them """
+        with self._condition:
+            self._shutdown = True
+            self._condition.notify_all()
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+    def _next(self):
+        """ Takes one page of the document at the front, which then goes to the back of the queue """
+        with self._condition:
+            while not self._documents and not self._shutdown:
+                self._condition.wait()
+            if not self._documents:
+                return None
+            document = self._documents.popleft()
+            index, args = document.pending.popleft()
+            if document.pending:
+                self._documents.append(document)
+            return document, index, args
+
+    def _worker(self):
+        while True:
+            task = self._next()
+            if task is None:
+                return
+            document, index, args = task
+            try:
+                result = document.function(*args)
+            except Exception as e:
+                logger.error(f"OCR task {index} failed: {e}")
+                result = None
+            document.done(index, result)
+
+
+# the scheduler shared by every PdfDataCollector of this process
+_SCHEDULER = None
+_SCHEDULER_LOCK = Lock()
+
+def getScheduler():
+    """ Returns the process wide scheduler, created on first use """
+    global _SCHEDULER
+    with _SCHEDULER_LOCK:
+        if _SCHEDULER is None:
+            _SCHEDULER = OcrScheduler()
+        return _SCHEDULER
+
+def configureScheduler(max_workers):
+    """ Sets the number of OCR threads of this process, call before the first OCR,
+        e.g. 1 per process inside a process pool that already uses every core
+    """
+    global _SCHEDULER
+    with _SCHEDULER_LOCK:
+        if _SCHEDULER is not None:
+            _SCHEDULER.shutdown()
+        _SCHEDULER = OcrScheduler(max_workers)
+        return _SCHEDULER
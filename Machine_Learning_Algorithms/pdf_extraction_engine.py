@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 21:16:44 2026
+
+@author: ngoni97
+"""
+# どうもありがとうございます == Dōmo arigatōgozaimasu
+
+# reads the pdf files with a pool of processes instead of threads,
+# the pymupdf extraction and the regex cleaning are cpu bound and threads
+# only take turns on the GIL, separate processes run them side by side
+
+import os
+import time
+import logging
+import itertools
+import concurrent.futures
+from concurrent.futures import ProcessPoolExecutor
+
+from fixed_pdf_collector import PdfDataCollector
+from text_normalisation import loadResources
+from extraction_cache import ExtractionCache
+from corpus_store import CorpusStore
+from ocr_scheduler import configureScheduler
+
+logger = logging.getLogger(__name__)
+
+# the collector settings of this worker process, set once by _initWorker
+_SETTINGS = {}
+
+def _initWorker(pages, save_as_text_file, normalise, cache_path, store_path, options):
+    """ Runs once in every worker process: keeps the settings, opens the cache and the store,
+        loads the stopwords before the first document
+    """
+    # every process needs its own sqlite connection
+    cache = ExtractionCache(cache_path) if cache_path else None
+    store = CorpusStore(store_path) if store_path else None
+    _SETTINGS.update(pages=pages, save_as_text_file=save_as_text_file, normalise=normalise, cache=cache,
+                     store=store, options=options)
+    loadResources()
+    # the pool already runs a process per core, one OCR thread each keeps it at that
+    configureScheduler(1)
+
+def _extractChunk(files):
+    """ Reads a chunk of pdf files inside a worker process, returns [(file, text, stats)]
+
+        stats is the collector's page counts plus the seconds taken and the length of the text
+    """
+    results = []
+    for file in files:
+        start = time.perf_counter()
+        try:
+            collector = PdfDataCollector(file, _SETTINGS['pages'], _SETTINGS['save_as_text_file'],
+                                         normalise=_SETTINGS['normalise'], cache=_SETTINGS['cache'],
+                                         store=_SETTINGS['store'],
+                                         **_SETTINGS['options'])
+            text, stats = collector.text, dict(collector.stats)
+        except Exception as e:
+            # one broken file mustn't lose the rest of the chunk
+            logger.error(f"Error reading {file}: {e}")
+            text, stats = "", {'error': str(e)}
+        stats.update(seconds=time.perf_counter() - start, characters=len(text))
+        results.append((file, text, stats))
+    return results
+
+
+class PdfExtractionEngine():
+    """
+    A pool of processes that reads pdf files with PdfDataCollector
+
+    the files are sent to the workers in chunks of chunksize files,
+    one task per file would spend more time pickling than reading small pdfs,
+    cache_path is an extraction_cache.ExtractionCache database shared by the workers,
+    ocr_options are passed on to every collector (dpi, adaptive_dpi, low_dpi, min_word_ratio),
+    max_tokens/max_characters stop reading a document once that much text has been collected,
+    max_memory is a ceiling on the bytes of text kept per document,
+    toc_first reads bookmarked documents from their outline (PdfDataCollector.toc_document),
+    store_path is a corpus_store.CorpusStore the texts are saved to (with save_as_text_file=True)
+    """
+    def __init__(self, pages=10, normalise=False, save_as_text_file=False, *, max_workers=None, chunksize=4,
+                 cache_path=None, ocr_options=None, max_tokens=None, max_characters=None,
+                 toc_first=False, store_path=None, max_memory=None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunksize = chunksize
+        # keyword arguments of every PdfDataCollector
+        options = dict(ocr_options or {}, max_tokens=max_tokens, max_characters=max_characters, toc_first=toc_first,
+                       max_memory=max_memory)
+        self.executor = ProcessPoolExecutor(max_workers=self.max_workers, initializer=_initWorker,
+                                            initargs=(pages, save_as_text_file, normalise, cache_path, store_path,
+                                                      options))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.shutdown()
+
+    def shutdown(self, wait=True):
+        """ Stops the worker processes """
+        self.executor.shutdown(wait=wait, cancel_futures=not wait)
+
+    def submit(self, files):
+        """ Queues the files in chunks, returns a list of futures of [(file, text, stats)] """
+        files = list(files)
+        return [self.executor.submit(_extractChunk, files[i:i + self.chunksize])
+                for i in range(0, len(files), self.chunksize)]
+
+    def extract(self, files):
+        """ Reads the files and returns {file: text} in the order of files """
+        texts = dict.fromkeys(files, "")
+        for future in concurrent.futures.as_completed(self.submit(texts)):
+            texts.update((file, text) for file, text, _ in future.result())
+        return texts
+
+    def iterExtract(self, files, *, window=None):
+        """ Generator mode: yields (file, text, stats) as each chunk finishes
+
+            files can be any iterable (e.g. a lazy folder walk), it is only read
+            as far as needed to keep window chunks in flight (2 per worker by default),
+            so a slow consumer holds back the reading instead of piling up results
+        """
+        window = window or 2 * self.max_workers
+        files = iter(files)
+        pending = set()
+        try:
+            while True:
+                while len(pending) < window:
+                    chunk = list(itertools.islice(files, self.chunksize))
+                    if not chunk:
+                        break
+                    pending.add(self.executor.submit(_extractChunk, chunk))
+                if not pending:
+                    return
+                done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    yield from future.result()
+        finally:
+            # the consumer stopped early, drop what hasn't started yet
+            for future in pending:
+                future.cancel()
+
+
+def makeTestPdfs(folder, *, count=32, pages=10):
+    """ Writes count digitally-born pdf files for timing, returns their paths """
+    import pymupdf
+
+    paragraph = ("The quick brown fox jumps over the lazy dog whilst the integral of x squared "
+                 "from zero to one equals one third. ") * 12
+    files = []
+    for i in range(count):
+        doc = pymupdf.open()
+        for _ in range(pages):
+            doc.new_page().insert_textbox(pymupdf.Rect(50, 50, 550, 800), paragraph)
+        path = os.path.join(folder, 'document_{}.pdf'.format(i))
+        doc.save(path)
+        doc.close()
+        files.append(path)
+    return files
+
+def time_it(*, count=32, pages=10, workers=(1, 2, 4, 8)):
+    """ timing the engine with a growing number of worker processes """
+    import shutil
+    import tempfile
+
+    folder = tempfile.mkdtemp(prefix='pdf_engine_')
+    try:
+        files = makeTestPdfs(folder, count=count, pages=pages)
+        single = None
+        for max_workers in workers:
+            with PdfExtractionEngine(pages, max_workers=max_workers) as engine:
+                start = time.perf_counter()
+                texts = engine.extract(files)
+                elapsed = time.perf_counter() - start
+            assert all(texts.values())
+            single = single or elapsed
+            print('{:>2} workers: {:.3f} s  ({:.1f}x)'.format(max_workers, elapsed, single / elapsed))
+    finally:
+        shutil.rmtree(folder)
+
+if __name__ == "__main__":
+    time_it()
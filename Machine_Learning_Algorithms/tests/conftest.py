@@ -0,0 +1,6 @@
+# -*- coding: utf-8 -*-
+# the modules import each other by their plain names, as when they're run from Machine_Learning_Algorithms
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
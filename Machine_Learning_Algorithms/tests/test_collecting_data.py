@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+import os
+
+import numpy as np
+
+from collecting_data import CollectingData
+from directory_index import DirectoryIndex
+
+# (file name, contents, file type, None if it isn't collected)
+FILES = [
+    ('book.pdf', b'%PDF-1.4 book', 'document'),
+    ('photo.jpg', b'\xff\xd8\xff\xe0\x00\x10JFIF\x00', 'image'),
+    # no extension or one the table doesn't know, the contents decide
+    ('scan', b'%PDF-1.7 scanned book', 'document'),
+    ('picture.dat2', b'\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR', 'image'),
+    ('notes', b'just some notes', None),
+]
+
+def makeFolder(root):
+    for name, data, _ in FILES:
+        with open(os.path.join(root, name), 'wb') as file:
+            file.write(data)
+    # a folder named like a document is not a file
+    os.mkdir(os.path.join(root, 'folder.pdf'))
+
+def rows(result):
+    return sorted(tuple(row) for row in result['data'])
+
+def test_same_data_with_and_without_index(tmp_path):
+    root = tmp_path / 'folder'
+    root.mkdir()
+    makeFolder(str(root))
+    stats_file = str(tmp_path / 'statistics.txt')
+
+    plain = CollectingData(str(root), stats_file=stats_file)
+    index = DirectoryIndex(str(tmp_path / 'index.sqlite'))
+    try:
+        indexed = CollectingData(str(root), index=index, stats_file=stats_file)
+    finally:
+        index.close()
+
+    expected = sorted((name, file_type, str(len(data))) for name, data, file_type in FILES
+                      if file_type is not None)
+    assert rows(plain) == rows(indexed) == expected
+    # the rows are still returned as an array
+    assert isinstance(plain['data'], np.ndarray)
+    assert plain['data'].shape == (len(expected), 3)
+
+def test_seeded_shuffle(tmp_path):
+    root = tmp_path / 'folder'
+    root.mkdir()
+    makeFolder(str(root))
+    stats_file = str(tmp_path / 'statistics.txt')
+    first = CollectingData(str(root), stats_file=stats_file)['data']
+    again = CollectingData(str(root), stats_file=stats_file)['data']
+    assert first.tolist() == again.tolist()
+    ordered = CollectingData(str(root), Shuffle=False, stats_file=stats_file)['data']
+    assert [row[1] for row in ordered] == ['document', 'document', 'image', 'image']
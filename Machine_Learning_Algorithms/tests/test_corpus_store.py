@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+import os
+
+from corpus_store import CorpusStore, RECORD_HEADER, RECORD_MAGIC
+
+TEXTS = {'book_{}'.format(i): 'theorem proof lemma {} '.format(i) * 200 for i in range(6)}
+
+def shardSizes(root):
+    return {name: os.path.getsize(os.path.join(root, name)) for name in sorted(os.listdir(root))
+            if name.endswith('.rec')}
+
+def fillStore(root, **options):
+    with CorpusStore(root, **options) as store:
+        for doc_id, text in TEXTS.items():
+            store.put(doc_id, text, 'Mathematics')
+
+def test_partial_record_truncated(tmp_path):
+    root = str(tmp_path)
+    fillStore(root)
+    sizes = shardSizes(root)
+    # a crash halfway through an append, the record is on disk but not in the index
+    shard = os.path.join(root, next(iter(sizes)))
+    with open(shard, 'ab') as file:
+        file.write(RECORD_HEADER.pack(RECORD_MAGIC, 6, 1000, 0) + b'book_9' + b'\x00' * 100)
+    assert shardSizes(root) != sizes
+
+    with CorpusStore(root) as store:
+        assert shardSizes(root) == sizes
+        assert len(store) == len(TEXTS)
+        assert all(store.get(doc_id) == text for doc_id, text in TEXTS.items())
+        store.put('book_9', 'a new book')
+        assert store.get('book_9') == 'a new book'
+
+def test_same_text_not_appended_again(tmp_path):
+    root = str(tmp_path)
+    fillStore(root)
+    sizes = shardSizes(root)
+    fillStore(root)
+    assert shardSizes(root) == sizes
+    with CorpusStore(root) as store:
+        # the category still follows the last put()
+        store.put('book_0', TEXTS['book_0'], 'Algebra')
+        assert shardSizes(root) == sizes
+        assert store.ids('Algebra') == ['book_0']
+
+def test_changed_text_of_same_length_stored(tmp_path):
+    root = str(tmp_path)
+    with CorpusStore(root) as store:
+        store.put('book', 'abcd' * 100)
+        store.put('book', 'abce' * 100)
+        assert store.get('book') == 'abce' * 100
+
+def test_compact(tmp_path):
+    root = str(tmp_path)
+    fillStore(root, shard_size=2000)
+    changed = dict(TEXTS)
+    with CorpusStore(root, shard_size=2000) as store:
+        for doc_id in list(changed)[::2]:
+            changed[doc_id] = 'replaced ' + doc_id
+            store.put(doc_id, changed[doc_id], 'Physics')
+        before = sum(shardSizes(root).values())
+        freed = store.compact()
+        assert freed > 0
+        assert sum(shardSizes(root).values()) == before - freed
+        assert {doc_id: text for doc_id, _, text in store.iterDocuments()} == changed
+        assert all(store.get(doc_id) == text for doc_id, text in changed.items())
+
+    with CorpusStore(root, shard_size=2000) as store:
+        assert {doc_id: text for doc_id, _, text in store.iterDocuments()} == changed
+        assert sorted(store.ids('Physics')) == sorted(list(TEXTS)[::2])
+
+def test_unindexed_shards_removed(tmp_path):
+    root = str(tmp_path)
+    fillStore(root)
+    # what a crash of compact() leaves behind once the index points at the new shards
+    stale = os.path.join(root, 'shard-00007.rec')
+    with open(stale, 'wb') as file:
+        file.write(b'old records')
+    with CorpusStore(root) as store:
+        assert not os.path.exists(stale)
+        assert all(store.get(doc_id) == text for doc_id, text in TEXTS.items())
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+import os
+import shutil
+import importlib.util
+
+import pytest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+# the Application keeps its own copy of the module
+COPIES = [os.path.join(HERE, '..', 'directory_index.py'),
+          os.path.join(HERE, '..', '..', 'Application', 'directory_index.py')]
+
+def loadModule(path):
+    spec = importlib.util.spec_from_file_location('directory_index_{}'.format(abs(hash(path))), path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+@pytest.fixture(params=COPIES, ids=['Machine_Learning_Algorithms', 'Application'])
+def index(request, tmp_path):
+    index = loadModule(request.param).DirectoryIndex(str(tmp_path / 'index.sqlite'))
+    yield index
+    index.close()
+
+def makeTree(root, folders):
+    for folder in folders:
+        os.makedirs(os.path.join(root, folder))
+        open(os.path.join(root, folder, 'book.pdf'), 'w').close()
+
+def touchFolder(path, name='new.pdf'):
+    """ Adds a file, the folder's mtime has to move on even on a coarse filesystem clock """
+    before = os.stat(path).st_mtime_ns
+    open(os.path.join(path, name), 'w').close()
+    if os.stat(path).st_mtime_ns == before:
+        os.utime(path, ns=(before + 10 ** 9, before + 10 ** 9))
+
+def relativeFolders(index, root, path):
+    return [os.path.relpath(folder, root) for folder, _ in index.iterFolders(path)]
+
+def test_only_changed_folder_rescanned(index, tmp_path):
+    root = str(tmp_path / 'tree')
+    makeTree(root, ['a', 'a/x', 'b', 'b/y', 'c'])
+    index.update(root)
+    assert index.scanned_folders == 6
+
+    index.update(root)
+    assert (index.scanned_folders, index.skipped_folders) == (0, 6)
+
+    touchFolder(os.path.join(root, 'b', 'y'))
+    index.update(root)
+    assert (index.scanned_folders, index.skipped_folders) == (1, 5)
+    assert dict(index.iterFolders(os.path.join(root, 'b', 'y'))) == {
+        os.path.join(root, 'b', 'y'): ['book.pdf', 'new.pdf']}
+
+    index.update(root, full=True)
+    assert index.scanned_folders == 6
+
+def test_prefix_sibling_not_matched(index, tmp_path):
+    root = str(tmp_path / 'tree')
+    makeTree(root, ['Foo', 'Foo/sub', 'foo', 'foo/sub', 'Foo-bar', 'Foo_', 'Fo%'])
+    index.update(root)
+    assert relativeFolders(index, root, os.path.join(root, 'Foo')) == ['Foo', 'Foo/sub']
+    assert relativeFolders(index, root, os.path.join(root, 'Fo%')) == ['Fo%']
+
+    # forgetting the deleted Foo leaves its siblings alone
+    shutil.rmtree(os.path.join(root, 'Foo'))
+    index.update(root)
+    assert relativeFolders(index, root, root) == ['Fo%', 'Foo-bar', 'Foo_', 'foo', 'foo/sub']
+    assert index.categoryCounts(os.path.join(root, 'foo', 'sub'))[0] == 1
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+import os
+import shutil
+
+import pytest
+
+import extraction_cache
+from extraction_cache import ExtractionCache, HASH_BYTES, extractionOptions
+
+OPTIONS = extractionOptions(10, True)
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ExtractionCache(str(tmp_path / 'cache.sqlite'))
+    yield cache
+    cache.close()
+
+def writeFile(path, data, mtime_ns=None):
+    with open(path, 'wb') as file:
+        file.write(data)
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+    return os.stat(path)
+
+def store(cache, path, text='some text'):
+    st = os.stat(path)
+    assert cache.get(path, st, OPTIONS) is None
+    cache.put(path, st, OPTIONS, text, {'pages': 1})
+
+def test_miss_then_hit(tmp_path, cache):
+    path = str(tmp_path / 'book.pdf')
+    st = writeFile(path, b'%PDF-1.4 book')
+    store(cache, path)
+    assert cache.get(path, st, OPTIONS) == ('some text', {'pages': 1})
+    assert (cache.hits, cache.misses) == (1, 1)
+    # other options are another entry
+    assert cache.get(path, st, extractionOptions(20, True)) is None
+
+def test_copy_is_a_hit(tmp_path, cache):
+    path = str(tmp_path / 'book.pdf')
+    writeFile(path, b'%PDF-1.4 book')
+    store(cache, path)
+    copy = str(tmp_path / 'copy.pdf')
+    shutil.copyfile(path, copy)
+    assert cache.get(copy, os.stat(copy), OPTIONS) == ('some text', {'pages': 1})
+
+@pytest.mark.parametrize('change', ['size', 'head', 'tail'])
+def test_changed_file_misses(tmp_path, cache, change):
+    path = str(tmp_path / 'book.pdf')
+    data = bytearray(b'%PDF-1.4' + b'x' * (3 * HASH_BYTES))
+    st = writeFile(path, data, 1_000_000_000)
+    store(cache, path)
+    if change == 'size':
+        data += b'x'
+    elif change == 'head':
+        data[10] = ord('y')
+    else:
+        data[-1] = ord('y')
+    st = writeFile(path, data, 2_000_000_000)
+    assert cache.get(path, st, OPTIONS) is None
+
+def test_normaliser_version_misses(tmp_path, cache, monkeypatch):
+    path = str(tmp_path / 'book.pdf')
+    st = writeFile(path, b'%PDF-1.4 book')
+    store(cache, path)
+    monkeypatch.setattr(extraction_cache, 'NORMALISER_VERSION', extraction_cache.NORMALISER_VERSION + 1)
+    assert cache.get(path, st, extractionOptions(10, True)) is None
+    # the texts that aren't normalised don't depend on it
+    assert extractionOptions(10, False) == 'pages=10;normalise=False;normaliser=0;ocr=;budget=;mode=pages'
+
+def test_misses_not_kept(tmp_path, cache):
+    for i in range(20):
+        path = str(tmp_path / 'book_{}.pdf'.format(i))
+        st = writeFile(path, '%PDF-1.4 book {}'.format(i).encode())
+        assert cache.get(path, st, OPTIONS) is None
+    # only the last miss is remembered, put() of it doesn't hash the file again
+    cache.put(path, st, OPTIONS, 'book 19')
+    assert cache._miss is None
+    assert cache.get(path, st, OPTIONS) == ('book 19', {})
+    # put() without a get() hashes the file itself
+    other = str(tmp_path / 'book_0.pdf')
+    cache.put(other, os.stat(other), OPTIONS, 'book 0')
+    assert cache.get(other, os.stat(other), OPTIONS) == ('book 0', {})
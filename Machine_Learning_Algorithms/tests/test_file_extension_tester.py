@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+import os
+import importlib.util
+
+import pytest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+# the Application keeps its own copy of the module
+COPIES = [os.path.join(HERE, '..', 'file_extension_tester.py'),
+          os.path.join(HERE, '..', '..', 'Application', 'file_extension_tester.py')]
+
+DOCUMENTS, IMAGES, MUSIC, VIDEOS, PROGRAMMING, EXECUTABLE = range(6)
+
+# (file name, contents, category sniffed from the contents)
+FILES = [
+    # misleading extensions, sniffFile only looks at the contents
+    ('scan.txt', b'%PDF-1.7\n%\xe2\xe3\xcf\xd3\n', DOCUMENTS),
+    ('photo.pdf', b'\xff\xd8\xff\xe0\x00\x10JFIF\x00', IMAGES),
+    ('song.jpg', b'ID3\x04\x00\x00\x00\x00\x00\x00', MUSIC),
+    # missing extensions
+    ('book', b'%PDF-1.4 rest of the book', DOCUMENTS),
+    ('picture', b'\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR', IMAGES),
+    ('movie', b'\x00\x00\x00\x18ftypmp42\x00\x00\x00\x00', VIDEOS),
+    ('clip', b'\x1aE\xdf\xa3\x93B\x82\x88matroska', VIDEOS),
+    ('script', b'#!/bin/sh\necho hi\n', EXECUTABLE),
+    ('program', b'\x7fELF\x02\x01\x01\x00', EXECUTABLE),
+    ('config', b'<?xml version="1.0"?><a/>', PROGRAMMING),
+    ('novel', b'PK\x03\x04' + b'\x00' * 26 + b'mimetypeapplication/epub+zip', DOCUMENTS),
+    ('archive', b'PK\x03\x04' + b'\x00' * 26 + b'word/document.xml', DOCUMENTS),
+    ('app', b'PK\x03\x04' + b'\x00' * 26 + b'AndroidManifest.xml', EXECUTABLE),
+    # shorter than the signatures they start like
+    ('short_pdf', b'%PDF', None),
+    ('short_zip', b'PK\x03\x04' + b'\x00' * 10, None),
+    ('short_ogg', b'OggS', VIDEOS),
+    ('two_bytes', b'MZ', EXECUTABLE),
+    ('one_byte', b'%', None),
+    ('empty', b'', None),
+    ('text', b'just some notes', None),
+]
+
+@pytest.fixture(params=COPIES, ids=['Machine_Learning_Algorithms', 'Application'])
+def tester(request):
+    spec = importlib.util.spec_from_file_location('file_extension_tester_{}'.format(request.param_index),
+                                                  request.param)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+@pytest.fixture
+def folder(tmp_path):
+    for name, data, _ in FILES:
+        with open(tmp_path / name, 'wb') as file:
+            file.write(data)
+    return tmp_path
+
+def test_sniffFile(tester, folder):
+    for name, _, category in FILES:
+        assert tester.sniffFile(str(folder / name)) == category, name
+
+def test_sniffFiles(tester, folder, monkeypatch):
+    paths = [str(folder / name) for name, _, _ in FILES]
+    expected = [category for _, _, category in FILES]
+    assert tester.sniffFiles(paths) == expected
+    # the same without os.preadv (windows)
+    monkeypatch.delattr(tester.os, 'preadv', raising=False)
+    assert tester.sniffFiles(paths) == expected
+
+def test_not_regular_files(tester, tmp_path):
+    os.mkdir(tmp_path / 'folder.pdf')
+    paths = [str(tmp_path / 'folder.pdf'), str(tmp_path / 'missing')]
+    if hasattr(os, 'mkfifo'):
+        os.mkfifo(tmp_path / 'pipe')
+        paths.append(str(tmp_path / 'pipe'))
+    assert tester.sniffFiles(paths) == [None] * len(paths)
+    assert [tester.sniffFile(path) for path in paths] == [None] * len(paths)
+
+def test_listDirFiles(tester, folder):
+    buckets = tester.listDirFiles(str(folder), size=False)
+    # the extension wins where there is one, the rest are sniffed
+    assert sorted(buckets[DOCUMENTS]) == ['archive', 'book', 'novel', 'photo.pdf', 'scan.txt']
+    assert sorted(buckets[IMAGES]) == ['picture', 'song.jpg']
+    assert sorted(buckets[EXECUTABLE]) == ['app', 'program', 'script', 'two_bytes']
+    assert sorted(buckets[VIDEOS]) == ['clip', 'movie', 'short_ogg']
+    assert 'empty' not in sum(buckets, [])
+    assert tester.listDirFiles(str(folder), sniff=False)[DOCUMENTS] == 2
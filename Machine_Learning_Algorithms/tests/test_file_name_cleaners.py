@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+import re
+import random
+
+import dataset_collector_saver
+from dataset_collector_saver_class import LoadDataset
+
+FILE_NAMES = [
+    "Calculus_Early-Transcendentals 8th Edition",
+    "Feynman's Lectures on Physics (Vol. 1)",
+    "e.g. Linear Algebra Done Right 3rd ed.",
+    "Schrödinger's Cat & Quantum ~Mechanics~ @2019",
+    "C++ Primer: 5th [Edition] 50% off?! $$",
+    "  tabs\tand\nnewlines  ",
+    "",
+]
+
+def oldCleaner(sentence, keep_apostrophes=False):
+    """ dataset_collector_saver.remove_characters_before_tokenization before the tables """
+    sentence = (sentence.replace('_', ' ')).replace('-', ' ')
+    if keep_apostrophes:
+        PATTERN = r'[?|$|&|*|%|@|(|)|~]'
+        filtered_sentence = re.sub(PATTERN, r'', sentence)
+    else:
+        PATTERN = r'[^a-zA-Z0-9 ]'
+        filtered_sentence = re.sub(PATTERN, r'', sentence)
+    return filtered_sentence.lower()
+
+def oldClassCleaner(sentence, keep_apostrophes=False):
+    """ LoadDataset.remove_characters_before_tokenization before the tables """
+    sentence = (sentence.replace('_', ' ')).replace('-', ' ')
+    if keep_apostrophes:
+        PATTERN = r'[?|$|&|*|%|@|(|)|~]'
+        pattern = re.compile('[^a-zA-Z]')
+        filtered_sentence = re.sub(pattern, r' ', re.sub(PATTERN, r'', sentence))
+    else:
+        PATTERN = r'[^a-zA-Z0-9]'
+        pattern = re.compile('[^a-zA-Z]')
+        filtered_sentence = re.sub(pattern, r' ', re.sub(PATTERN, r'', sentence))
+    return filtered_sentence.lower()
+
+def randomNames(count=2000, seed=0):
+    rng = random.Random(seed)
+    alphabet = "aZ9 _-'.?|$&*%@()~\t,;:!#[]éßİ中 "
+    return [''.join(rng.choice(alphabet) for _ in range(rng.randrange(30))) for _ in range(count)]
+
+def test_cleaner_unchanged():
+    for name in FILE_NAMES + randomNames():
+        for keep_apostrophes in (False, True):
+            assert (dataset_collector_saver.remove_characters_before_tokenization(name, keep_apostrophes)
+                    == oldCleaner(name, keep_apostrophes))
+
+def test_class_cleaner_unchanged():
+    # the cleaner doesn't use the dataset, no folder needs to be read
+    dataset = LoadDataset.__new__(LoadDataset)
+    for name in FILE_NAMES + randomNames():
+        for keep_apostrophes in (False, True):
+            assert (dataset.remove_characters_before_tokenization(name, keep_apostrophes)
+                    == oldClassCleaner(name, keep_apostrophes))
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+import os
+
+from directory_index import DirectoryIndex
+from folder_iterator_class import FolderIterator, parallelScanFolders, scanFolders
+
+# the same folder names in several places, 'Algebra' and 'Notes' more than once
+TREE = {
+    'Zoology/Notes': ['z.pdf'],
+    'Mathematics/Notes': ['b.pdf', 'a.pdf'],
+    'Mathematics/Algebra': ['groups.pdf'],
+    'Mathematics-Old/Algebra': ['rings.pdf'],
+    'Mathematics/Algebra/Notes': ['c.pdf'],
+    'Physics/Notes': ['d.pdf'],
+    'Physics/Algebra': ['vectors.pdf'],
+}
+
+def makeTree(root):
+    for folder, files in TREE.items():
+        os.makedirs(os.path.join(root, folder), exist_ok=True)
+        for name in files:
+            open(os.path.join(root, folder, name), 'w').close()
+
+def test_walkers_same_order(tmp_path):
+    root = str(tmp_path / 'tree')
+    makeTree(root)
+    expected = list(scanFolders(root))
+    assert [os.path.relpath(dir_path, root) for dir_path, _ in expected] == [
+        'Mathematics/Algebra', 'Mathematics/Algebra/Notes', 'Mathematics/Notes',
+        'Mathematics-Old/Algebra', 'Physics/Algebra', 'Physics/Notes', 'Zoology/Notes']
+    for workers in (1, 2, 8):
+        assert list(parallelScanFolders(root, max_workers=workers)) == expected
+
+    index = DirectoryIndex(str(tmp_path / 'index.sqlite'))
+    try:
+        assert list(index.update(root).iterFolders(root)) == expected
+    finally:
+        index.close()
+
+def test_folder_iterator_same_categories(tmp_path):
+    root = str(tmp_path / 'tree')
+    makeTree(root)
+    serial = FolderIterator(root, folder_name=False)
+    assert serial.returnDirPathNames() == [os.path.join(root, folder) for folder in (
+        'Mathematics/Algebra', 'Mathematics/Algebra/Notes')]
+    for workers in (1, 2, 8):
+        parallel = FolderIterator(root, folder_name=False, workers=workers)
+        assert parallel.categories == serial.categories
+        assert parallel.returnDirPathNames() == serial.returnDirPathNames()
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+import threading
+
+import pytest
+
+from ocr_scheduler import OcrScheduler
+
+@pytest.fixture
+def scheduler():
+    scheduler = OcrScheduler(1)
+    yield scheduler
+    scheduler.shutdown()
+
+def test_round_robin(scheduler):
+    order = []
+    started, gate = threading.Event(), threading.Event()
+
+    def page(document, number):
+        if not order:
+            # the first page holds the only worker until every document is queued
+            started.set()
+            gate.wait(5)
+        order.append(document + str(number))
+        return document + str(number)
+
+    futures = [scheduler.submit(page, [('a', number) for number in range(3)])]
+    assert started.wait(5)
+    futures += [scheduler.submit(page, [(document, number) for number in range(pages)])
+                for document, pages in (('b', 5), ('c', 2))]
+    gate.set()
+    results = [future.result(timeout=5) for future in futures]
+
+    # one page of each document in turn, the document whose page was taken goes to the back
+    assert order == ['a0', 'a1', 'b0', 'c0', 'a2', 'b1', 'c1', 'b2', 'b3', 'b4']
+    # every document gets its results in page order
+    assert results == [['a0', 'a1', 'a2'], ['b0', 'b1', 'b2', 'b3', 'b4'], ['c0', 'c1']]
+
+def test_failing_page(scheduler):
+    def page(document, number):
+        if (document, number) == ('b', 1):
+            raise RuntimeError('tesseract failed')
+        return document + str(number)
+
+    futures = [scheduler.submit(page, [(document, number) for number in range(pages)])
+               for document, pages in (('a', 4), ('b', 3), ('c', 2))]
+    assert futures[0].result(timeout=5) == ['a0', 'a1', 'a2', 'a3']
+    # the failed page gives None, the rest of its document is still read
+    assert futures[1].result(timeout=5) == ['b0', None, 'b2']
+    assert futures[2].result(timeout=5) == ['c0', 'c1']
+
+def test_several_workers():
+    scheduler = OcrScheduler(4)
+    try:
+        futures = [scheduler.submit(lambda document, number: (document, number),
+                                    [(document, number) for number in range(pages)])
+                   for document, pages in enumerate((7, 1, 12))]
+        assert [future.result(timeout=5) for future in futures] == [
+            [(document, number) for number in range(pages)] for document, pages in enumerate((7, 1, 12))]
+        assert scheduler.submit(len, []).result(timeout=5) == []
+    finally:
+        scheduler.shutdown()
+    with pytest.raises(RuntimeError):
+        scheduler.submit(len, [('x',)])
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+import os
+
+import numpy as np
+import pymupdf
+import pytest
+
+from fixed_pdf_collector import PdfDataCollector
+
+def makePdf(path, pages):
+    """ A digitally-born pdf, one text per page """
+    doc = pymupdf.open()
+    for text in pages:
+        doc.new_page().insert_textbox(pymupdf.Rect(40, 40, 560, 810), text, fontsize=8)
+    doc.save(path)
+    doc.close()
+    return str(path)
+
+@pytest.mark.parametrize('text', [
+    'the quick brown fox jumps over the lazy dog ' * 20,
+    # no space inside the budget
+    'a' * 120,
+    'abcdefghij' * 3 + ' and some more words after the budget',
+])
+@pytest.mark.parametrize('max_characters', [1, 29, 30, 31, 100])
+def test_max_characters(tmp_path, text, max_characters):
+    path = makePdf(tmp_path / 'book.pdf', [text, text])
+    collector = PdfDataCollector(path, pages=None, max_characters=max_characters)
+    assert 0 < len(collector.text) <= max_characters
+    full = PdfDataCollector(path, pages=None).text
+    assert full.startswith(collector.text)
+
+@pytest.mark.parametrize('pages, front_matter_pages', [(None, 6), (2, 2), (4, 4), (1, 1)])
+def test_toc_front_matter_within_pages(tmp_path, pages, front_matter_pages):
+    words = ['alpha', 'bravo', 'charlie', 'delta', 'echo', 'foxtrot', 'golf', 'hotel', 'india', 'juliet',
+             'kilo', 'lima']
+    path = makePdf(tmp_path / 'book.pdf', ['{} page'.format(word) for word in words])
+    with pymupdf.open(path) as doc:
+        # two front matter sections of three pages each
+        doc.set_toc([[1, 'Preface', 1], [1, 'Chapter 1', 4], [1, 'Introduction', 5], [1, 'Chapter 2', 8]])
+        doc.saveIncr()
+    collector = PdfDataCollector(path, pages=pages, toc_first=True)
+    assert collector.stats['front_matter_pages'] == front_matter_pages
+    assert sum(word in collector.text.split() for word in words) == front_matter_pages
+
+def test_images_folder(tmp_path):
+    path = makePdf(tmp_path / 'book.pdf', ['some words'])
+    collector = PdfDataCollector(path, images_folder=str(tmp_path / 'images'))
+    collector.save_page_image(path, 0, np.zeros((8, 8), dtype=np.uint8))
+    assert (tmp_path / 'images' / 'book.pdf' / 'page_0001.png').is_file()
+    # without one the images stay inside the repository
+    assert PdfDataCollector(path).images_folder.startswith(
+        os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
@@ -0,0 +1,16 @@
+# -*- coding: utf-8 -*-
+import os
+
+from stripping_file_types import fileExtensionStripper
+
+def test_only_files_stripped(tmp_path):
+    for name in ['book.pdf', 'notes.txt', 'photo.jpg', 'song.mp3', 'book.epub']:
+        open(tmp_path / name, 'w').close()
+    # folders named like files
+    os.mkdir(tmp_path / 'folder.pdf')
+    os.mkdir(tmp_path / 'album.mp3')
+    documents, images, music, videos, programming, executable = fileExtensionStripper(str(tmp_path))
+    assert sorted(documents) == ['book', 'notes']
+    assert images == ['photo']
+    assert music == ['song']
+    assert videos == programming == executable == []
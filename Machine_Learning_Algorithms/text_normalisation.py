@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Tue Oct 20 17:05:22 2026
+
+@author: ngoni97
+"""
+# どうもありがとうございます == Dōmo arigatōgozaimasu
+
+# the text cleaning and stopword removal shared by the pdf collectors, the datasets and the model,
+# every normalize_document used to reload the nltk stopwords, build a new WordPunctTokenizer
+# and look every token up in a list of ~200 words, here the stopwords are a frozenset
+# loaded once per process and the regex is compiled at import
+
+import re
+import time
+import string
+
+import nltk
+
+def _cleaningTable(keep_apostrophes):
+    """ bytes.translate table: letters to lower case, (apostrophes kept or) every other byte to a space """
+    keep = string.ascii_letters + ("'" if keep_apostrophes else '')
+    return bytes(ord(chr(byte).lower()) if chr(byte) in keep else ord(' ') for byte in range(256))
+
+_CLEANING_TABLES = {False: _cleaningTable(False), True: _cleaningTable(True)}
+
+def cleanText(sentence, keep_apostrophes=False):
+    """ remove characters and keeps words only
+
+        every character but the ascii letters (and apostrophes with keep_apostrophes)
+        becomes a space and the letters are lower cased in one bytes.translate pass,
+        the words are then joined by single spaces
+    """
+    if not sentence:
+        return ""
+    # non ascii characters become '?' (a space after translate), str.translate
+    # looks every one of them up in a dict, bytes.translate is a plain table lookup
+    data = sentence.encode('ascii', 'replace').translate(_CLEANING_TABLES[bool(keep_apostrophes)])
+    return b' '.join(data.split()).decode('ascii')
+
+# everything but letters, digits and whitespace, removed before tokenizing
+NON_ALPHANUMERIC = re.compile(r'[^a-zA-Z0-9\s]')
+
+ROMAN_NUMERALS = ('i', 'ii', 'iii', 'iv', 'v', 'vi', 'vii', 'viii', 'ix', 'x',
+                  'xi', 'xii', 'xiii', 'xiv', 'xv', 'xvi', 'xvii', 'xviii', 'xix', 'xx')
+CARDINALS = ('nd', 'rd', 'th')
+
+# the nltk stopwords + single letters + roman numerals + cardinals, see loadResources()
+_STOP_WORDS = None
+
+# part of the extraction_cache key, bumped whenever normaliseDocument gives a different text
+# 2: the special characters are all removed (re.I used to be passed as the count) and str.split() tokens
+NORMALISER_VERSION = 2
+
+def loadResources():
+    """ Loads the stopwords the first time it's called, returns them as a frozenset
+
+        also used as the initializer of the pdf_extraction_engine worker processes
+    """
+    global _STOP_WORDS
+    if _STOP_WORDS is None:
+        _STOP_WORDS = frozenset(nltk.corpus.stopwords.words('english')
+                                + list('qwertyuiopasdfghjklzxcvbnm') + list(ROMAN_NUMERALS) + list(CARDINALS))
+    return _STOP_WORDS
+
+def normaliseDocument(doc, stop_words=None):
+    """ lower case, remove the special characters and the stopwords
+
+        only letters, digits and whitespace are left once the special characters are gone,
+        so str.split() gives the same tokens WordPunctTokenizer did
+    """
+    stop_words = loadResources() if stop_words is None else stop_words
+    tokens = NON_ALPHANUMERIC.sub('', doc).lower().split()
+    return ' '.join([token for token in tokens if token not in stop_words])
+
+def normaliseDocuments(docs):
+    """ normaliseDocument for a list of documents, returns a list """
+    stop_words = loadResources()
+    return [normaliseDocument(doc, stop_words) for doc in docs]
+
+
+def _oldNormaliseDocument(doc):
+    """ The old normalize_document, kept for time_it()
+
+        it used to pass re.I as the count of re.sub, so only the first two special characters
+        were removed, that's fixed here so both versions give the same text
+    """
+    roman_numerals = ['i', 'ii', 'iii', 'iv', 'v', 'vi', 'vii', 'viii', 'ix', 'x',
+               'xi', 'xii', 'xiii', 'xiv', 'xv', 'xvi', 'xvii', 'xviii', 'xix', 'xx']
+    cardinals = ['nd', 'rd', 'th']
+    stop_words = nltk.corpus.stopwords.words('english')
+    stop_words = stop_words + list('qwertyuiopasdfghjklzxcvbnm') + roman_numerals + cardinals
+    wpt = nltk.WordPunctTokenizer()
+
+    doc = re.sub(r'[^a-zA-Z0-9\s]', '', doc)
+    doc = doc.lower()
+    doc = doc.strip()
+    tokens = wpt.tokenize(doc)
+    filtered_tokens = [token for token in tokens if token not in stop_words]
+    return ' '.join(filtered_tokens)
+
+def _oldCleanText(sentence, keep_apostrophes=False):
+    """ The old remove_characters_before_tokenization, kept for time_it() """
+    if not sentence:
+        return ""
+    sentence = (sentence.replace('_', ' ')).replace('-', ' ')
+    PATTERN = re.compile('[?|$|&|*|%|@|(|)|~]')
+    pattern = re.compile('[^a-zA-Z]') if not keep_apostrophes else re.compile('[^a-zA-Z\']')
+    filtered_sentence = re.sub(pattern, r' ', re.sub(PATTERN, r' ', sentence))
+    return ' '.join(filtered_sentence.lower().split())
+
+def makeBook(words=200000, seed=0):
+    """ A book sized text: words words of english with punctuation """
+    import random
+
+    vocabulary = ('The theorem of Chapter IV, proven in the 2nd section, shows that every finite group '
+                  'of order p^2 is abelian; the proof (see Lemma 3.1) is short! It is also a classic '
+                  'example which we\'ll use again and again when we discuss the Sylow theorems '
+                  '(Ludwig Sylow, 1872) - or the Schrödinger equation_s').split()
+    rng = random.Random(seed)
+    return ' '.join(rng.choice(vocabulary) for _ in range(words))
+
+def time_it(count=5, words=200000):
+    """ timing the old normalize_document against normaliseDocuments, per book """
+    books = [makeBook(words, seed) for seed in range(count)]
+
+    start = time.perf_counter()
+    old = [_oldNormaliseDocument(book) for book in books]
+    old_time = time.perf_counter() - start
+
+    loadResources()
+    start = time.perf_counter()
+    new = normaliseDocuments(books)
+    new_time = time.perf_counter() - start
+    assert old == new
+
+    print('{} books of {} words'.format(count, words))
+    print('old:  {:>8.2f} ms per book'.format(old_time / count * 1000))
+    print('new:  {:>8.2f} ms per book  ({:.1f}x)'.format(new_time / count * 1000, old_time / new_time))
+
+def time_cleaning(count=5, words=1000000):
+    """ timing the old regex cleaner against cleanText on multi-megabyte books """
+    books = [makeBook(words, seed) for seed in range(count)]
+    megabytes = sum(len(book) for book in books) / count / 1024 ** 2
+
+    print('{} books of {:.1f} MB'.format(count, megabytes))
+    for keep_apostrophes in (False, True):
+        start = time.perf_counter()
+        old = [_oldCleanText(book, keep_apostrophes) for book in books]
+        old_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        new = [cleanText(book, keep_apostrophes) for book in books]
+        new_time = time.perf_counter() - start
+        assert old == new
+
+        print('keep_apostrophes={!s:<5}  old: {:>7.2f} ms per book  new: {:>7.2f} ms per book  ({:.1f}x)'.format(
+            keep_apostrophes, old_time / count * 1000, new_time / count * 1000, old_time / new_time))
+
+if __name__ == "__main__":
+    time_it()
+    time_cleaning()
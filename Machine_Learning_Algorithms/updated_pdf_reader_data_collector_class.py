@@ -23,6 +23,8 @@ import numpy as np
 import matplotlib.pyplot as plt
 import logging
 
+from text_normalisation import cleanText, normaliseDocument
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -47,38 +49,11 @@ class PdfDataCollector():
         #print("\n\nText =", TEXT)
         
     def remove_characters_before_tokenization(self, sentence,keep_apostrophes=False):
-        if not sentence:
-            return ""
-        # string
-        sentence = (sentence.replace('_', ' ')).replace('-', ' ')
-        PATTERN = re.compile('[?|$|&|*|%|@|(|)|~]')
-        pattern = re.compile('[^a-zA-Z]') if not keep_apostrophes else re.compile('[^a-zA-Z\']')
-        replacement = r' '
-        
-        filtered_sentence = re.sub(pattern, replacement, re.sub(PATTERN, replacement, sentence))
-        return ' '.join(filtered_sentence.lower().split())  # Remove extra spaces
+        return cleanText(sentence, keep_apostrophes)
 
     def normalize_document(self, doc):
         """ tokenize and remove stopwords """
-        # stopwords
-        roman_numerals = ['i', 'ii', 'iii', 'iv', 'v', 'vi', 'vii', 'viii', 'ix', 'x',
-                   'xi', 'xii', 'xiii', 'xiv', 'xv', 'xvi', 'xvii', 'xviii', 'xix', 'xx']
-        cardinals = ['nd', 'rd', 'th']
-        self.stop_words = nltk.corpus.stopwords.words('english')
-        self.stop_words = self.stop_words + list('qwertyuiopasdfghjklzxcvbnm') + roman_numerals + cardinals
-        self.wpt = nltk.WordPunctTokenizer()
-
-        # lower case and remove special characters\whitespaces
-        doc = re.sub(r'[^a-zA-Z0-9\s]', '', doc, re.I)
-        doc = doc.lower()
-        doc = doc.strip()
-        # tokenize document
-        tokens = self.wpt.tokenize(doc)
-        # filter stopwords out of document
-        filtered_tokens = [token for token in tokens if token not in self.stop_words]
-        # re-create document from filtered tokens
-        doc = ' '.join(filtered_tokens)
-        return doc
+        return normaliseDocument(doc)
 
     def advanced_image_preprocessing(self, image):
         """
@@ -205,9 +180,8 @@ class PdfDataCollector():
                 thread.join()
                 time.sleep(0.5)
         
-        Text = ""
-        for page in sorted(self.book_dict):
-            Text += self.book_dict[page]
+        # joined once, += copied the whole text again for every page
+        Text = ' '.join(self.book_dict[page] for page in sorted(self.book_dict))
 
         return Text
 
@@ -284,6 +258,7 @@ class PdfDataCollector():
             if digital_pages > 0:
                 # Digital PDF processing (safer)
                 #print(f"Processing digitally-born pdf: {filename}\n")
+                page_texts = []
                 for page_num in range(pages_to_process):
                     try:
                         page = doc[page_num]
@@ -291,9 +266,11 @@ class PdfDataCollector():
                             continue
                         text = page.get_text()
                         if text:
-                            self.Text += text
+                            page_texts.append(text)
                     except Exception:
                         continue
+                # joined once at the end instead of page by page
+                self.Text = ''.join(page_texts)
             
             elif ocr_pages > 0:
                 # OCR processing with reduced concurrency
@@ -14,45 +14,60 @@ Created on Tue Feb 18 00:50:46 2025
 @author: ngoni97
 """
 # どうもありがとうございます == Dōmo arigatōgozaimasu
-# using multithreading
+# using a pool of processes (pdf_extraction_engine)
 
 # reading the PDFs after colleciing them
 
 import os
 from collections.abc import Iterable
-from threading import Lock
-import concurrent.futures
-import time
-import os
- 
+
 from fixed_pdf_collector import PdfDataCollector
+from pdf_extraction_engine import PdfExtractionEngine
 from folder_iterator_class import FolderIterator
-from file_extension_tester import listDirFiles
+from file_extension_tester import classifyFiles
 
 class DocumentContentDataset():
     """ A class that takes in a folder and reads the pdf files inside
         concurrently and returns text files 
     """
 
-    def __init__(self, folder,*, specific_file,
-                 pages=10, normalise=False, save_as_text_file=False):
+    def __init__(self, folder,*, specific_file='pdf',
+                 pages=10, normalise=False, save_as_text_file=False, index=None, workers=None, lazy=False,
+                 cache='extraction_cache.sqlite', max_tokens=None, toc_first=False,
+                 store=None):
         
         self._folder_path = folder # the parent folder containing the children folders
         self.specific_file = specific_file # specific_files refers to pdf, docx, etc. 
         self._pages = pages
         self.normalise = normalise
         self._save_as_text_file = save_as_text_file
-        self.lock = Lock()
+        # number of worker processes, None uses every core
+        self._workers = workers
+        # extraction_cache database, unchanged pdf files aren't read again (None turns it off)
+        self._cache = cache
+        # words of cleaned text per document, the rest of the pages aren't read (None reads them all)
+        self._max_tokens = max_tokens
+        # bookmarked pdf files are read from their outline and front matter only
+        self._toc_first = toc_first
+        # corpus_store directory the texts are saved to instead of .txt files (with save_as_text_file=True)
+        self._store = store
         
-        self.Folder = FolderIterator(self._folder_path, folder_name=False)
+        # the folders are walked lazily in processData so the first pdf files
+        # are already being read whilst the rest of the tree is still being listed
+        self.Folder = FolderIterator(self._folder_path, folder_name=False, lazy=True, index=index)
         self.subFolders = self.Folder.returnCategories()
-
-        self.files = [file for file, *_ in
-                      [listDirFiles(folder, size=False, fullpath=True) for folder in self.subFolders]]
-        
-        self.returnFiles()
-        # start the process
-        self.processData()
+        self.files = []
+        # file path -> extracted text
+        self.texts = {}
+        # category (folder name) of the files handed to the workers but not yielded yet
+        self._categories = {}
+
+        # lazy=True leaves the reading to iterDocuments() so the results
+        # can be consumed one by one instead of being kept in self.texts
+        if not lazy:
+            # start the process
+            self.processData()
+            self.returnFiles()
 
     def start_process(self, file):
         """
@@ -74,17 +89,48 @@ class DocumentContentDataset():
 
         return self.process
     
+    def _documents(self, keep_files=False):
+        """ Yields the pdf files folder by folder as the walker finds them,
+            keep_files=True also keeps them in self.files for returnFiles()
+        """
+        for folder, files in self.Folder.iterFolders():
+            # the walker already listed the folder, only classify the names
+            documents = [os.path.join(folder, file) for file in classifyFiles(files)[0]]
+            if keep_files:
+                self.files.append(documents)
+            category = os.path.basename(folder)
+            for file in documents:
+                self._categories[file] = category
+                yield file
+
+    def iterDocuments(self, *, window=None):
+        """ Generator mode: yields (path, category, text, stats) as each document is read
+
+            at most window chunks of files are being read at a time (see
+            PdfExtractionEngine.iterExtract), nothing is kept once it has been yielded
+            so the memory use doesn't grow with the size of the folder
+        """
+        return self._iterDocuments(window=window)
+
+    def _iterDocuments(self, *, window=None, keep_files=False):
+        """ iterDocuments(), keep_files=True keeps the file paths in self.files """
+        try:
+            with PdfExtractionEngine(self._pages, self.normalise, self._save_as_text_file,
+                                     max_workers=self._workers, cache_path=self._cache,
+                                     max_tokens=self._max_tokens, toc_first=self._toc_first,
+                                     store_path=self._store) as engine:
+                for path, text, stats in engine.iterExtract(self._documents(keep_files), window=window):
+                    yield path, self._categories.pop(path), text, stats
+        finally:
+            # left over when the consumer stops early
+            self._categories.clear()
+
     def processData(self):
         """ Returns a dictionary of files (keys) and their respective text (values)"""
-
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            results = [executor.submit(self.start_process, file) for file in list(self.Flatten(self.files))]
-            
-            concurrent.futures.wait(results)
-            with self.lock:
-                for result_ in results:
-                    result_.result()
-                    time.sleep(0.5)
+        # the eager path keeps everything, the file paths for returnFiles() as well
+        for path, _, text, _ in self._iterDocuments(keep_files=True):
+            self.texts[path] = text
+        return self.texts
 
     def returnFiles(self):
         """ Returns a dictionary where the keys are the folder paths